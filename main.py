@@ -10,16 +10,12 @@ Implements MVP pattern with separated concerns for maintainability.
 import asyncio
 import logging
 import os
+from collections import namedtuple
+from pathlib import Path
 from dotenv import load_dotenv
-from telegram.ext import Application
+from telegram.ext import AIORateLimiter, Application, Defaults
 
-# Import our MVP components
-from presenters.bot_presenter import BotPresenter
-from services.scanner_service import ScannerService
-from services.pdf_service import PDFReportService
-
-# Load environment variables
-load_dotenv()
+from utils.event_loop import install_event_loop_policy
 
 # Configure logging
 logging.basicConfig(
@@ -28,57 +24,100 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Maximum number of updates processed concurrently
+MAX_CONCURRENT_UPDATES = 32
+
+# Long-poll timeout in seconds for getUpdates
+POLLING_TIMEOUT = 30
+
+REQUIRED_VARS = ('BOT_TOKEN', 'ADMIN_CHAT_ID', 'TARGET_TOPIC_ID')
+
+# Parsed, immutable bot configuration
+Config = namedtuple('Config', 'bot_token admin_chat_id target_topic_id')
+
+def load_environment():
+    """Load variables from .env unless the process environment already provides them."""
+    if all(os.getenv(var) for var in REQUIRED_VARS):
+        return
+    
+    dotenv_path = Path(__file__).resolve().parent / '.env'
+    if dotenv_path.exists():
+        load_dotenv(dotenv_path=dotenv_path, override=False)
+
 def validate_environment():
-    """Validate required environment variables."""
-    required_vars = ['BOT_TOKEN', 'ADMIN_CHAT_ID', 'TARGET_TOPIC_ID']
-    missing_vars = []
+    """Validate required environment variables.
     
-    for var in required_vars:
-        if not os.getenv(var):
-            missing_vars.append(var)
+    Returns:
+        Dictionary of required variable values, or None if any are missing
+    """
+    env = os.environ
+    values = {var: env.get(var) for var in REQUIRED_VARS}
+    missing_vars = [var for var, value in values.items() if not value]
     
     if missing_vars:
-        logger.error(f"Missing required environment variables: {', '.join(missing_vars)}")
+        logger.error("Missing required environment variables: %s", ', '.join(missing_vars))
         logger.error("Please check your .env file and ensure all required variables are set.")
-        return False
+        return None
+    
+    return values
+
+def _load_config() -> Config:
+    """Load, validate and parse the bot configuration once.
     
-    return True
+    Returns:
+        Parsed configuration
+        
+    Raises:
+        SystemExit: If a variable is missing or not a valid integer
+    """
+    load_environment()
+    
+    env = validate_environment()
+    if env is None:
+        logger.error("❌ Environment validation failed. Exiting.")
+        raise SystemExit(1)
+    
+    try:
+        admin_chat_id = int(env['ADMIN_CHAT_ID'])
+        target_topic_id = int(env['TARGET_TOPIC_ID'])
+    except ValueError as e:
+        logger.error("❌ ADMIN_CHAT_ID and TARGET_TOPIC_ID must be integers: %s", e)
+        raise SystemExit(1)
+    
+    return Config(env['BOT_TOKEN'], admin_chat_id, target_topic_id)
 
 def main():
     """Main function to start the Telegram bot."""
     logger.info("🚀 Starting Telegram Recon Bot...")
     
-    # Validate environment
-    if not validate_environment():
-        logger.error("❌ Environment validation failed. Exiting.")
-        return
+    config = _load_config()
     
-    # Get configuration from environment
-    bot_token = os.getenv('BOT_TOKEN')
-    admin_chat_id_str = os.getenv('ADMIN_CHAT_ID')
-    target_topic_id_str = os.getenv('TARGET_TOPIC_ID')
+    logger.info("📋 Configuration loaded: admin=%s topic=%s", config.admin_chat_id, config.target_topic_id)
     
-    # Convert to integers with validation
-    admin_chat_id = int(admin_chat_id_str) if admin_chat_id_str else 0
-    target_topic_id = int(target_topic_id_str) if target_topic_id_str else 0
-    
-    logger.info(f"📋 Configuration loaded:")
-    logger.info(f"   Admin Chat ID: {admin_chat_id}")
-    logger.info(f"   Target Topic ID: {target_topic_id}")
+    # Must run before the application creates its event loop
+    install_event_loop_policy()
     
     try:
-        # Initialize services
-        scanner_service = ScannerService()
-        pdf_service = PDFReportService()
+        # Import MVP components only once the configuration is known to be valid
+        from presenters.bot_presenter import BotPresenter
         
-        # Initialize presenter with services
+        # Initialize presenter (it owns the scanner and PDF services)
         bot_presenter = BotPresenter(
-            admin_chat_id=str(admin_chat_id),
-            target_topic_id=str(target_topic_id)
+            admin_chat_id=str(config.admin_chat_id),
+            target_topic_id=str(config.target_topic_id)
         )
         
-        # Create application
-        application = Application.builder().token(bot_token).build()
+        # Create application; updates from different chats are handled concurrently
+        application = (
+            Application.builder()
+            .token(config.bot_token)
+            .concurrent_updates(MAX_CONCURRENT_UPDATES)
+            .defaults(Defaults(block=False))
+            .rate_limiter(AIORateLimiter())
+            .post_init(bot_presenter.start)
+            .post_shutdown(bot_presenter.close)
+            .build()
+        )
         
         # Register handlers through presenter
         bot_presenter.register_handlers(application)
@@ -86,14 +125,18 @@ def main():
         logger.info("✅ Bot initialized successfully")
         logger.info("🔄 Starting polling...")
         
-        # Start the bot
+        # Start the bot with long polling: Telegram holds each getUpdates
+        # request open until updates arrive or the timeout expires
         application.run_polling(
             allowed_updates=['message', 'callback_query'],
-            drop_pending_updates=True
+            drop_pending_updates=True,
+            poll_interval=0.0,
+            timeout=POLLING_TIMEOUT,
+            bootstrap_retries=-1
         )
         
     except Exception as e:
-        logger.error(f"❌ Failed to start bot: {e}")
+        logger.error("❌ Failed to start bot: %s", e)
         raise
 
 if __name__ == '__main__':
@@ -102,5 +145,5 @@ if __name__ == '__main__':
     except KeyboardInterrupt:
         logger.info("\n🛑 Bot stopped by user")
     except Exception as e:
-        logger.error(f"💥 Fatal error: {e}")
+        logger.error("💥 Fatal error: %s", e)
         raise
\ No newline at end of file
@@ -4,12 +4,17 @@ Scan Result Model
 Handles scan result data structure and operations
 """
 
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
 
+import orjson
 
-@dataclass
+
+@dataclass(slots=True)
 class CredentialMatch:
     """Data class for credential matches"""
     type: str
@@ -19,73 +24,142 @@ class CredentialMatch:
     line_number: Optional[int] = None
     confidence: str = "medium"
 
+    def __post_init__(self):
+        # Confidence is one of a few values; interning makes comparisons identity checks
+        self.confidence = sys.intern(self.confidence)
+
 
-@dataclass
+@dataclass(slots=True)
 class EndpointMatch:
     """Data class for endpoint matches"""
     url: str
     method: str
     source: str
     line_number: Optional[int] = None
-    parameters: Optional[List[str]] = None
+    parameters: List[str] = field(default_factory=list)
 
     def __post_init__(self):
-        if self.parameters is None:
-            self.parameters = []
+        self.method = sys.intern(self.method)
+
+
+# Serialization keys and getters for to_dict
+_CRED_KEYS = ('type', 'value', 'context', 'source', 'line_number', 'confidence')
+_CRED_GET = attrgetter(*_CRED_KEYS)
+_ENDPOINT_KEYS = ('url', 'method', 'source', 'line_number', 'parameters')
+_ENDPOINT_GET = attrgetter(*_ENDPOINT_KEYS)
 
 
-@dataclass
+@dataclass(slots=True)
 class ScanResult:
     """Main scan result data structure"""
     target_url: str
     scan_time: datetime
-    credentials: List[CredentialMatch]
-    endpoints: List[EndpointMatch]
+    credentials: List[CredentialMatch] = field(default_factory=list)
+    endpoints: List[EndpointMatch] = field(default_factory=list)
     scan_duration: float = 0.0
     status: str = "completed"
     error_message: Optional[str] = None
+    _confidence_counts: Counter = field(default_factory=Counter, init=False, repr=False, compare=False)
+    _iso_scan_time: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    # Keys of the findings already recorded, so repeats are dropped on insert
+    _credential_keys: Set[Tuple[str, str]] = field(default_factory=set, init=False, repr=False, compare=False)
+    _endpoint_keys: Set[Tuple[str, str]] = field(default_factory=set, init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        if not self.credentials:
-            self.credentials = []
-        if not self.endpoints:
-            self.endpoints = []
+        self.status = sys.intern(self.status)
+        if self.credentials:
+            self._confidence_counts.update(c.confidence for c in self.credentials)
+            self._credential_keys.update((c.type, c.value) for c in self.credentials)
+        if self.endpoints:
+            self._endpoint_keys.update((e.url, e.method) for e in self.endpoints)
+
+    @property
+    def iso_scan_time(self) -> str:
+        """Scan time in ISO 8601 format, formatted once and reused"""
+        if self._iso_scan_time is None:
+            self._iso_scan_time = self.scan_time.isoformat()
+        return self._iso_scan_time
+
+    def add_credential(self, credential: CredentialMatch) -> bool:
+        """Add a credential match and update the risk counters
+        
+        Returns:
+            False if the same type and value was already recorded
+        """
+        key = (credential.type, credential.value)
+        if key in self._credential_keys:
+            return False
+        self._credential_keys.add(key)
+        self.credentials.append(credential)
+        self._confidence_counts[credential.confidence] += 1
+        return True
+
+    def add_endpoint(self, endpoint: EndpointMatch) -> bool:
+        """Add an endpoint match
+        
+        Returns:
+            False if the same URL and method was already recorded
+        """
+        key = (endpoint.url, endpoint.method)
+        if key in self._endpoint_keys:
+            return False
+        self._endpoint_keys.add(key)
+        self.endpoints.append(endpoint)
+        return True
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert scan result to dictionary"""
+        """Convert scan result to dictionary
+        
+        Prefer to_json_bytes when the result is only going to be serialized.
+        """
         return {
             'target_url': self.target_url,
-            'scan_time': self.scan_time.isoformat(),
-            'credentials': [{
-                'type': cred.type,
-                'value': cred.value,
-                'context': cred.context,
-                'source': cred.source,
-                'line_number': cred.line_number,
-                'confidence': cred.confidence
-            } for cred in self.credentials],
-            'endpoints': [{
-                'url': ep.url,
-                'method': ep.method,
-                'source': ep.source,
-                'line_number': ep.line_number,
-                'parameters': ep.parameters
-            } for ep in self.endpoints],
+            'scan_time': self.iso_scan_time,
+            'credentials': [dict(zip(_CRED_KEYS, _CRED_GET(cred))) for cred in self.credentials],
+            'endpoints': [dict(zip(_ENDPOINT_KEYS, _ENDPOINT_GET(ep))) for ep in self.endpoints],
             'scan_duration': self.scan_duration,
             'status': self.status,
             'error_message': self.error_message
         }
 
+    def to_json_bytes(self) -> bytes:
+        """Serialize scan result to JSON bytes
+        
+        orjson walks the dataclass fields natively, so no intermediate
+        dictionary is built. The output decodes to the same data as
+        json.dumps(self.to_dict()), but uses compact separators, so the
+        bytes themselves differ.
+        """
+        return orjson.dumps(self)
+
+    def findings_bytes(self) -> bytes:
+        """Serialize the target URL, findings and status, leaving out scan timing
+        
+        Results with the same findings produce the same bytes, so this
+        can key caches of output derived from the findings.
+        """
+        return orjson.dumps((
+            self.target_url,
+            [_CRED_GET(cred) for cred in self.credentials],
+            [_ENDPOINT_GET(ep) for ep in self.endpoints],
+            self.status,
+            self.error_message
+        ))
+
     def has_findings(self) -> bool:
         """Check if scan has any findings"""
-        return len(self.credentials) > 0 or len(self.endpoints) > 0
+        return bool(self.credentials or self.endpoints)
 
     def get_summary(self) -> Dict[str, int]:
-        """Get summary statistics"""
+        """Get summary statistics
+        
+        Risk counts are maintained by add_credential, so this is O(1).
+        """
+        counts = self._confidence_counts
         return {
             'total_credentials': len(self.credentials),
             'total_endpoints': len(self.endpoints),
-            'high_risk_credentials': len([c for c in self.credentials if c.confidence == 'high']),
-            'medium_risk_credentials': len([c for c in self.credentials if c.confidence == 'medium']),
-            'low_risk_credentials': len([c for c in self.credentials if c.confidence == 'low'])
+            'high_risk_credentials': counts['high'],
+            'medium_risk_credentials': counts['medium'],
+            'low_risk_credentials': counts['low']
         }
\ No newline at end of file
@@ -6,10 +6,17 @@ Implements MVP pattern - Presenter layer for bot operations
 """
 
 import asyncio
+import hashlib
+import inspect
 import logging
-import os
+import multiprocessing
 import re
-from typing import Optional, Dict, Any, TYPE_CHECKING
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Optional, Dict, Any, Final, Set, Tuple, TYPE_CHECKING
 from datetime import datetime
 
 # Type checking imports
@@ -26,13 +33,232 @@ else:
         from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
         from telegram.constants import ParseMode
     except ImportError as e:
-        logging.error(f"Failed to import Telegram modules: {e}")
+        logging.error("Failed to import Telegram modules: %s", e)
         raise
 
 from services.scanner_service import ScannerService
-from services.pdf_service import PDFReportService
 from models.scan_result import ScanResult
 
+# Scan result cache settings
+SCAN_CACHE_SIZE = 64
+SCAN_CACHE_TTL = 300  # seconds
+
+# Rendered PDF cache settings
+PDF_CACHE_SIZE = 10
+PDF_CACHE_MAX_BYTES = 50 * 1024 * 1024
+PDF_CACHE_TTL = SCAN_CACHE_TTL  # seconds; bounds how stale a report's scan time can be
+
+# Longest a single website scan may run before it is abandoned, in seconds
+SCAN_TIMEOUT = 300
+
+# Longest a chat's queued work may hold its lock (a scan plus sending results), in seconds
+CHAT_LOCK_TIMEOUT = SCAN_TIMEOUT + 120
+
+# Worker processes rendering PDF reports in parallel
+PDF_WORKERS = 2
+
+# Active scan tracking limits: entry cap, stale-entry age and sweep period
+ACTIVE_SCANS_MAX = 256
+ACTIVE_SCAN_TTL = 1800  # seconds
+ACTIVE_SCAN_SWEEP_INTERVAL = 60  # seconds
+
+# Minimum seconds between wrong-topic warnings in the same chat
+WRONG_TOPIC_WARNING_INTERVAL = 30
+
+# Minimum seconds between progress edits of a status message
+PROGRESS_EDIT_INTERVAL = 1.5
+
+# Telegram group link pattern used by /enter: https://t.me/c/CHAT_ID/TOPIC_ID
+_GROUP_URL_RE = re.compile(r'https://t\.me/c/(\d+)/(\d+)')
+
+# Chat types in which the bot only answers inside the target topic
+_GROUP_TYPES = frozenset({'group', 'supergroup'})
+
+# URL prefixes accepted as-is by _normalize_url
+_URL_SCHEMES = ('http://', 'https://')
+
+# Static reply messages
+_WELCOME_MSG: Final = (
+    "🎯 *Welcome to Telegram Recon Bot!*\n\n"
+    "🔍 This bot helps you perform *reconnaissance* to detect:"
+    "\n• 🔑 Exposed credentials (API keys, tokens)"
+    "\n• 🌐 Accessible API endpoints\n\n"
+    "📋 *Available Commands:*\n"
+    "• `/help` - Complete help\n"
+    "• `/scan <URL>` - Scan website\n"
+    "• `/status` - Bot status and active scans\n"
+    "• `/reportpdf <URL>` - Generate PDF report\n\n"
+    "⚠️ *Important:* Only scan websites you own or have permission!"
+)
+
+_HELP_MSG: Final = (
+    "📖 *Bot Usage Guide*\n\n"
+    "🔍 *Scanning Commands:*\n"
+    "• `/scan <URL>` - Scan website for credentials\n"
+    "• `/scan <URL> --force` - Rescan, ignoring recent results\n"
+    "• `/reportpdf <URL>` - Generate complete PDF report\n"
+    "• `/status` - View running scan status\n\n"
+    "💡 *Usage Examples:*\n"
+    "• `/scan example.com`\n"
+    "• `/scan https://target.com`\n"
+    "• `/reportpdf https://example.com`\n\n"
+    "🎯 *Fitur Deteksi:*\n"
+    "• 🔑 API Keys (Firebase, AWS, Google)\n"
+    "• 🔐 Access Tokens & Secret Keys\n"
+    "• 🌐 API Endpoints from JavaScript\n\n"
+    "⚠️ *Security Notes:*\n"
+    "• Only scan websites you own\n"
+    "• Use for legitimate security purposes\n"
+    "• Report findings to website owners"
+)
+
+_USAGE_SCAN: Final = (
+    "❌ Wrong format!\n\n"
+    "Usage: /scan <URL> [--force]\n"
+    "Example: /scan example.com"
+)
+
+_SCAN_ALREADY_RUNNING_MSG: Final = (
+    "⚠️ Scan already running for this URL!\n\n"
+    "Use /status to view progress."
+)
+
+_STATUS_IDLE_MSG: Final = (
+    "✅ Status Bot\n\n"
+    "🔍 No scan currently running\n"
+    "🤖 Bot ready to receive new commands!"
+)
+
+_ACCESS_DENIED_MSG: Final = (
+    "❌ Access denied!\n\n"
+    "This command is for admin only."
+)
+
+_USAGE_REPORT: Final = (
+    "❌ Format salah!\n\n"
+    "Usage: /report <URL>\n"
+    "Example: /report example.com"
+)
+
+_USAGE_REPORTPDF: Final = (
+    "❌ Format salah!\n\n"
+    "Usage: /reportpdf <URL>\n"
+    "Example: /reportpdf example.com"
+)
+
+_ADMIN_ONLY_MSG: Final = (
+    "❌ Akses ditolak!\n\n"
+    "Perintah ini hanya untuk admin."
+)
+
+_PRIVATE_CHAT_ONLY_MSG: Final = "❌ Perintah ini hanya bisa digunakan di private chat!"
+
+_USAGE_ENTER: Final = (
+    "❌ Format salah!\n\n"
+    "Gunakan: /enter <group_url>\n"
+    "Contoh: /enter https://t.me/c/123456789/5"
+)
+
+_INVALID_GROUP_URL_MSG: Final = (
+    "❌ Format URL group tidak valid!\n\n"
+    "Format yang benar: https://t.me/c/CHAT_ID/TOPIC_ID"
+)
+
+_MESSAGE_RECEIVED_MSG: Final = (
+    "✅ Pesan Anda telah diterima!\n\n"
+    "📨 Pesan telah diteruskan ke admin\n"
+    "⏱️ Admin akan merespons segera."
+)
+
+
+class ProgressMessageEditor:
+    """Debounced editor for a Telegram status message
+    
+    Edits arriving within PROGRESS_EDIT_INTERVAL of the previous one are
+    coalesced: only the latest pending text is sent when the interval ends.
+    Final edits are sent immediately and replace any pending text; once
+    one is made, later and already flushed non-final edits are dropped.
+    """
+    
+    def __init__(self, message, min_interval: float = PROGRESS_EDIT_INTERVAL):
+        """Initialize progress message editor
+        
+        Args:
+            message: Telegram message to edit
+            min_interval: Minimum seconds between edits
+        """
+        self.message = message
+        self.min_interval = min_interval
+        self._last_edit_ts = 0.0
+        self._last_edit_text: Optional[str] = None
+        self._pending_text: Optional[str] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._final = False  # Set once a final edit was requested
+        self._lock = asyncio.Lock()
+        self.logger = logging.getLogger(__name__)
+    
+    async def update(self, text: str, final: bool = False) -> None:
+        """Request an edit of the status message
+        
+        Args:
+            text: New message text
+            final: Send immediately, dropping any pending update
+        """
+        if final:
+            self._final = True
+            self._cancel_pending()
+            await self._edit(text, final=True)
+            return
+        
+        if self._final:
+            return
+        
+        wait = self._last_edit_ts + self.min_interval - time.monotonic()
+        if wait <= 0 and self._timer is None:
+            await self._edit(text)
+            return
+        
+        # Too soon after the last edit: keep only the latest text and flush it once
+        self._pending_text = text
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(max(wait, 0), self._flush)
+    
+    def _flush(self) -> None:
+        """Send the latest pending text (timer callback)"""
+        self._timer = None
+        text, self._pending_text = self._pending_text, None
+        if text is not None:
+            self._flush_task = asyncio.ensure_future(self._edit(text))
+    
+    def _cancel_pending(self) -> None:
+        """Cancel any scheduled edit"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._pending_text = None
+    
+    async def _edit(self, text: str, final: bool = False) -> None:
+        """Edit the message, skipping unchanged text
+        
+        Args:
+            text: New message text
+            final: Whether this is the final edit
+        """
+        # Serialize edits so an older flushed edit can't land after a newer one
+        async with self._lock:
+            # A flushed progress edit still waiting here must not overwrite the final text
+            if self._final and not final:
+                return
+            if text == self._last_edit_text:
+                return
+            self._last_edit_ts = time.monotonic()
+            self._last_edit_text = text
+            try:
+                await self.message.edit_text(text, parse_mode=None)
+            except Exception as e:
+                self.logger.warning("Failed to send progress update: %s", e)
+
 
 class BotPresenter:
     """Presenter class for Telegram bot interactions"""
@@ -45,15 +271,157 @@ class BotPresenter:
             target_topic_id: Target topic ID for group operations
         """
         self.admin_chat_id = admin_chat_id
-        self.target_topic_id = target_topic_id
+        self._set_target_topic(target_topic_id)
+        # Integer form for per-message comparisons against Telegram user IDs
+        try:
+            self._admin_chat_id_int = int(admin_chat_id)
+        except ValueError:
+            self._admin_chat_id_int = -1
         self.scanner_service = ScannerService()
-        self.pdf_service = PDFReportService()
-        self.active_scans: Dict[str, Any] = {}
+        self._pdf_executor: Optional[ProcessPoolExecutor] = None
+        self.active_scans: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._reaper_task: Optional[asyncio.Task] = None
+        self._scan_cache: 'OrderedDict[str, Tuple[float, ScanResult]]' = OrderedDict()
+        self._inflight: Dict[str, 'asyncio.Future[ScanResult]'] = {}
+        self._pdf_cache: 'OrderedDict[str, Tuple[float, bytes]]' = OrderedDict()
+        self._pdf_cache_bytes = 0
+        self._last_wrong_topic_warning: Dict[int, float] = {}
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._chat_locks: Dict[int, asyncio.Lock] = {}
+        # Tasks holding or waiting on each chat lock; the lock is dropped at zero
+        self._chat_lock_users: Counter = Counter()
         self.logger = logging.getLogger(__name__)
         
-        self.logger.info(f"🤖 Bot Presenter initialized")
-        self.logger.info(f"   Admin Chat ID: {self.admin_chat_id}")
-        self.logger.info(f"   Target Topic ID: {self.target_topic_id}")
+        self.logger.info("🤖 Bot Presenter initialized")
+        self.logger.info("   Admin Chat ID: %s", self.admin_chat_id)
+        self.logger.info("   Target Topic ID: %s", self.target_topic_id)
+    
+    @property
+    def pdf_executor(self) -> ProcessPoolExecutor:
+        """Process pool for PDF rendering, started on first use so worker
+        processes only exist once a report is actually requested"""
+        if self._pdf_executor is None:
+            # forkserver children don't inherit locks held by this process's
+            # threads (analysis pool, resolver) at the time of the fork
+            self._pdf_executor = ProcessPoolExecutor(
+                max_workers=PDF_WORKERS,
+                mp_context=multiprocessing.get_context('forkserver')
+            )
+        return self._pdf_executor
+    
+    def _reset_pdf_executor(self) -> None:
+        """Shut down the PDF process pool so the next use starts a fresh one"""
+        if self._pdf_executor is not None:
+            self._pdf_executor.shutdown(wait=False, cancel_futures=True)
+            self._pdf_executor = None
+    
+    async def start(self, application=None) -> None:
+        """Start background maintenance once the event loop is running
+        
+        Args:
+            application: Telegram application instance (passed by the init hook)
+        """
+        if self._reaper_task is None:
+            self._reaper_task = asyncio.create_task(self._reap_stale_scans())
+    
+    async def close(self, application=None) -> None:
+        """Release network resources held by the services
+        
+        Args:
+            application: Telegram application instance (passed by the shutdown hook)
+        """
+        if self._reaper_task is not None:
+            self._reaper_task.cancel()
+            self._reaper_task = None
+        
+        # Stop queued and running work before the services it uses are closed
+        tasks = list(self._background_tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        self._reset_pdf_executor()
+        await self.scanner_service.close()
+    
+    def _track_scan(self, scan_key: str, url: str) -> None:
+        """Record a running scan, evicting the oldest entries beyond the cap
+        
+        Args:
+            scan_key: Key identifying the user and URL
+            url: Normalized URL being scanned
+        """
+        self.active_scans[scan_key] = {
+            'url': url,
+            'start_time': time.monotonic(),
+            'status': 'running'
+        }
+        while len(self.active_scans) > ACTIVE_SCANS_MAX:
+            self.active_scans.popitem(last=False)
+    
+    async def _reap_stale_scans(self) -> None:
+        """Periodically drop active scan entries that outlived ACTIVE_SCAN_TTL"""
+        while True:
+            await asyncio.sleep(ACTIVE_SCAN_SWEEP_INTERVAL)
+            cutoff = time.monotonic() - ACTIVE_SCAN_TTL
+            # Entries are kept in insertion order, so stale ones are at the front
+            while self.active_scans:
+                scan_key, scan_info = next(iter(self.active_scans.items()))
+                if scan_info['start_time'] > cutoff:
+                    break
+                del self.active_scans[scan_key]
+                self.logger.warning("Dropped stale active scan: %s", scan_info['url'])
+    
+    def _spawn(self, coro) -> asyncio.Task:
+        """Run a coroutine in the background without blocking the handler
+        
+        Args:
+            coro: Coroutine to run
+            
+        Returns:
+            The scheduled task
+        """
+        task = asyncio.create_task(coro)
+        # Keep a reference so the task isn't garbage collected mid-flight
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+    
+    async def _serial(self, chat_id: int, coro, scan_key: Optional[str] = None) -> Any:
+        """Await a coroutine while holding the chat's lock
+        
+        Long-running work from one chat runs in arrival order without
+        holding up handlers for other chats. Work that holds the lock for
+        more than CHAT_LOCK_TIMEOUT is cancelled so later requests proceed.
+        
+        Args:
+            chat_id: Telegram chat ID
+            coro: Coroutine to run
+            scan_key: active_scans entry to drop if coro never gets to run
+            
+        Returns:
+            The coroutine's result, or None if it timed out
+        """
+        lock = self._chat_locks.get(chat_id)
+        if lock is None:
+            lock = self._chat_locks[chat_id] = asyncio.Lock()
+        self._chat_lock_users[chat_id] += 1
+        try:
+            async with lock:
+                return await asyncio.wait_for(coro, CHAT_LOCK_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.logger.warning("Chat %s work exceeded %ss and was cancelled", chat_id, CHAT_LOCK_TIMEOUT)
+            return None
+        finally:
+            if scan_key is not None and inspect.getcoroutinestate(coro) == inspect.CORO_CREATED:
+                # Cancelled while queued; the scan would otherwise stay listed until reaped
+                self.active_scans.pop(scan_key, None)
+            # No-op if it ran; avoids a never-awaited warning if cancelled while queued
+            coro.close()
+            self._chat_lock_users[chat_id] -= 1
+            if not self._chat_lock_users[chat_id]:
+                del self._chat_lock_users[chat_id]
+                del self._chat_locks[chat_id]
     
     def register_handlers(self, application) -> None:
         """Register all bot command and message handlers
@@ -63,26 +431,31 @@ class BotPresenter:
         """
         try:
             # Command handlers
-            application.add_handler(CommandHandler("start", self.handle_start_command))
-            application.add_handler(CommandHandler("help", self.handle_help_command))
-            application.add_handler(CommandHandler("scan", self.handle_scan_command))
-            application.add_handler(CommandHandler("status", self.handle_status_command))
-            application.add_handler(CommandHandler("report", self.handle_report_command))
-            application.add_handler(CommandHandler("reportpdf", self.handle_reportpdf_command))
-            application.add_handler(CommandHandler("enter", self.handle_enter_command))
+            handlers = [
+                CommandHandler("start", self.handle_start_command),
+                CommandHandler("help", self.handle_help_command),
+                CommandHandler("scan", self.handle_scan_command),
+                CommandHandler("status", self.handle_status_command),
+                CommandHandler("report", self.handle_report_command),
+                CommandHandler("reportpdf", self.handle_reportpdf_command),
+                CommandHandler("enter", self.handle_enter_command),
+            ]
             
             # Private message handler with safe filter combination
             if hasattr(filters, 'TEXT') and hasattr(filters, 'ChatType'):
                 try:
                     private_filter = filters.TEXT & filters.ChatType.PRIVATE
-                    application.add_handler(MessageHandler(private_filter, self.handle_private_message))
+                    handlers.append(MessageHandler(private_filter, self.handle_private_message))
                 except Exception as e:
-                    self.logger.warning(f"Could not register private message handler: {e}")
+                    self.logger.warning("Could not register private message handler: %s", e)
+            
+            # Register everything in a single batch
+            application.add_handlers(handlers)
             
             self.logger.info("✅ All handlers registered successfully")
             
         except Exception as e:
-            self.logger.error(f"❌ Failed to register handlers: {e}")
+            self.logger.error("❌ Failed to register handlers: %s", e)
             raise
     
     async def handle_start_command(self, update: Update, context) -> None:
@@ -96,26 +469,13 @@ class BotPresenter:
             if not self._is_valid_context(update):
                 return
             
-            welcome_message = (
-                "🎯 *Welcome to Telegram Recon Bot\!*\n\n"
-                "🔍 This bot helps you perform *reconnaissance* to detect:"
-                "\n• 🔑 Exposed credentials \(API keys, tokens\)"
-                "\n• 🌐 Accessible API endpoints\n\n"
-                "📋 *Available Commands:*\n"
-                "• `/help` \- Complete help\n"
-                "• `/scan <URL>` \- Scan website\n"
-                "• `/status` \- Bot status and active scans\n"
-                "• `/reportpdf <URL>` \- Generate PDF report\n\n"
-                "⚠️ *Important:* Only scan websites you own or have permission\!"
-            )
-            
             await update.message.reply_text(
-                welcome_message,
+                _WELCOME_MSG,
                 parse_mode=None
             )
             
         except Exception as e:
-            self.logger.error(f"Error in start command: {e}")
+            self.logger.error("Error in start command: %s", e)
             await self._send_error_message(update, "Failed to process start command")
     
     async def handle_help_command(self, update: Update, context) -> None:
@@ -129,33 +489,13 @@ class BotPresenter:
             if not self._is_valid_context(update):
                 return
             
-            help_message = (
-                "📖 *Bot Usage Guide*\n\n"
-                "🔍 *Scanning Commands:*\n"
-                "• `/scan <URL>` \- Scan website for credentials\n"
-                "• `/reportpdf <URL>` \- Generate complete PDF report\n"
-                "• `/status` \- View running scan status\n\n"
-                "💡 *Usage Examples:*\n"
-                "• `/scan example\.com`\n"
-                "• `/scan https://target\.com`\n"
-                "• `/reportpdf https://example\.com`\n\n"
-                "🎯 *Fitur Deteksi:*\n"
-                "• 🔑 API Keys \(Firebase, AWS, Google\)\n"
-                "• 🔐 Access Tokens & Secret Keys\n"
-                "• 🌐 API Endpoints from JavaScript\n\n"
-                "⚠️ *Security Notes:*\n"
-                "• Only scan websites you own\n"
-                "• Use for legitimate security purposes\n"
-                "• Report findings to website owners"
-            )
-            
             await update.message.reply_text(
-                help_message,
+                _HELP_MSG,
                 parse_mode=None
             )
             
         except Exception as e:
-            self.logger.error(f"Error in help command: {e}")
+            self.logger.error("Error in help command: %s", e)
             await self._send_error_message(update, "Failed to process help command")
     
     async def handle_scan_command(self, update: Update, context) -> None:
@@ -169,17 +509,18 @@ class BotPresenter:
             if not self._is_valid_context(update):
                 return
             
-            # Extract URL from command
-            if not context.args:
+            # Extract URL and options from command
+            force = '--force' in context.args
+            args = [arg for arg in context.args if arg != '--force']
+            
+            if not args:
                 await update.message.reply_text(
-                    "❌ Wrong format!\n\n"
-                    "Usage: /scan <URL>\n"
-                    "Example: /scan example.com",
+                    _USAGE_SCAN,
                     parse_mode=None
                 )
                 return
             
-            url = context.args[0]
+            url = args[0]
             normalized_url = self._normalize_url(url)
             
             # Check if scan is already running
@@ -188,81 +529,88 @@ class BotPresenter:
             
             if scan_key in self.active_scans:
                 await update.message.reply_text(
-                    "⚠️ Scan already running for this URL!\n\n"
-                    "Use /status to view progress.",
+                    _SCAN_ALREADY_RUNNING_MSG,
                     parse_mode=None
                 )
                 return
             
-            # Send initial status message
-            status_message = await update.message.reply_text(
-                f"🤖 Bot is running...\n⏳ Initializing scan process\n\n"
-                f"🎯 Target: {normalized_url}",
-                parse_mode=None
-            )
+            # Start scan in background; scans from the same chat run in order
+            self._track_scan(scan_key, normalized_url)
+            chat_id = getattr(update.effective_chat, 'id', 0)
+            self._spawn(self._serial(chat_id, self._do_scan(update, normalized_url, scan_key, force), scan_key))
             
-            # Create progress callback with status updates
-            async def progress_callback(message: str, js_files_count: int = 0):
-                try:
+        except Exception as e:
+            self.logger.error("Error in scan command: %s", e)
+            await self._send_error_message(update, "Failed to perform scanning")
+    
+    async def _do_scan(self, update: Update, normalized_url: str, scan_key: str, force: bool) -> None:
+        """Run a tracked scan and report progress and results to the chat
+        
+        Args:
+            update: Telegram update object
+            normalized_url: URL to scan
+            scan_key: Key of the scan's active_scans entry
+            force: Bypass the scan result cache
+        """
+        try:
+            try:
+                # Send initial status message
+                status_message = await update.message.reply_text(
+                    f"🤖 Bot is running...\n⏳ Initializing scan process\n\n"
+                    f"🎯 Target: {normalized_url}",
+                    parse_mode=None
+                )
+                
+                # Create progress callback with debounced status updates
+                progress_editor = ProgressMessageEditor(status_message)
+                
+                async def progress_callback(message: str, js_files_count: int = 0):
                     if js_files_count > 0:
-                        await status_message.edit_text(
+                        await progress_editor.update(
                             f"🤖 Bot is running...\n"
                             f"📁 Found {js_files_count} JS files\n"
                             f"🔍 Scanning JavaScript files...\n\n"
-                            f"🎯 Target: {normalized_url}",
-                            parse_mode=None
+                            f"🎯 Target: {normalized_url}"
                         )
                     else:
-                        await status_message.edit_text(
+                        await progress_editor.update(
                             f"🤖 Bot is running...\n"
                             f"🔍 {message}\n\n"
-                            f"🎯 Target: {normalized_url}",
-                            parse_mode=None
+                            f"🎯 Target: {normalized_url}"
                         )
-                except Exception as e:
-                    self.logger.warning(f"Failed to send progress update: {e}")
-            
-            # Start scan in background
-            self.active_scans[scan_key] = {
-                'url': normalized_url,
-                'start_time': datetime.now(),
-                'status': 'running'
-            }
-            
-            # Update status: Starting scan
-            await asyncio.sleep(1)
-            await status_message.edit_text(
-                f"🤖 Bot is running...\n"
-                f"🔍 Starting scan process\n"
-                f"⏳ Analyzing target URL\n\n"
-                f"🎯 Target: {normalized_url}",
-                parse_mode=None
-            )
-            
-            # Run scan with progress updates
-            self.scanner_service.progress_callback = progress_callback
-            scan_result = await self.scanner_service.scan_website(normalized_url)
-            
-            # Remove from active scans
-            if scan_key in self.active_scans:
-                del self.active_scans[scan_key]
-            
-            # Update final status
+                
+                # Update status: Starting scan
+                await progress_editor.update(
+                    f"🤖 Bot is running...\n"
+                    f"🔍 Starting scan process\n"
+                    f"⏳ Analyzing target URL\n\n"
+                    f"🎯 Target: {normalized_url}"
+                )
+                
+                # Run scan with progress updates
+                scan_result = await self._run_scan(normalized_url, progress_callback=progress_callback, force=force)
+            finally:
+                # Remove from active scans, even if the scan failed
+                self.active_scans.pop(scan_key, None)
+            
+            # Update final status and send detailed results concurrently
+            sends = [self._send_scan_results(update, scan_result)]
             if scan_result and scan_result.status != 'error':
-                await status_message.edit_text(
-                     f"🤖 Bot is running...\n"
-                     f"✅ Scan completed successfully!\n\n"
-                     f"🎯 Target: {normalized_url}\n"
-                     f"🔑 Credentials found: {len(scan_result.credentials)}\n"
-                     f"🌐 Endpoints found: {len(scan_result.endpoints)}",
-                     parse_mode=None
-                 )
-            
-            # Send detailed results
-            await self._send_scan_results(update, scan_result)
+                sends.append(progress_editor.update(
+                    f"🤖 Bot is running...\n"
+                    f"✅ Scan completed successfully!\n\n"
+                    f"🎯 Target: {normalized_url}\n"
+                    f"🔑 Credentials found: {len(scan_result.credentials)}\n"
+                    f"🌐 Endpoints found: {len(scan_result.endpoints)}",
+                    final=True
+                ))
+            
+            for outcome in await asyncio.gather(*sends, return_exceptions=True):
+                if isinstance(outcome, Exception):
+                    self.logger.warning("Failed to send scan results: %s", outcome)
             
         except Exception as e:
-            self.logger.error(f"Error in scan command: {e}")
+            self.logger.error("Error in scan command: %s", e)
             await self._send_error_message(update, "Failed to perform scanning")
     
     async def handle_status_command(self, update: Update, context) -> None:
@@ -278,30 +626,31 @@ class BotPresenter:
             
             if not self.active_scans:
                 await update.message.reply_text(
-                    "✅ Status Bot\n\n"
-                    "🔍 No scan currently running\n"
-                    "🤖 Bot ready to receive new commands!",
+                    _STATUS_IDLE_MSG,
                     parse_mode=None
                 )
                 return
             
-            status_message = "📊 Status Scan Aktif\n\n"
+            now = time.monotonic()
+            parts = ["📊 Status Scan Aktif\n\n"]
             
-            for scan_key, scan_info in self.active_scans.items():
-                duration = (datetime.now() - scan_info['start_time']).total_seconds()
-                status_message += (
+            for scan_info in self.active_scans.values():
+                duration = now - scan_info['start_time']
+                parts.append(
                     f"🎯 URL: {scan_info['url']}\n"
                     f"⏱️ Duration: {duration:.0f} seconds\n"
                     f"📈 Status: {scan_info['status']}\n\n"
                 )
             
+            status_message = "".join(parts)
+            
             await update.message.reply_text(
                 status_message,
                 parse_mode=None
             )
             
         except Exception as e:
-            self.logger.error(f"Error in status command: {e}")
+            self.logger.error("Error in status command: %s", e)
             await self._send_error_message(update, "Failed to get status")
     
     async def handle_report_command(self, update: Update, context) -> None:
@@ -314,10 +663,9 @@ class BotPresenter:
         try:
             # Check if user is admin
             user_id = getattr(update.effective_user, 'id', 0)
-            if str(user_id) != self.admin_chat_id:
+            if user_id != self._admin_chat_id_int:
                 await update.message.reply_text(
-                    "❌ Access denied!\n\n"
-                    "This command is for admin only.",
+                    _ACCESS_DENIED_MSG,
                     parse_mode=None
                 )
                 return
@@ -328,9 +676,7 @@ class BotPresenter:
             # Extract URL from command
             if not context.args:
                 await update.message.reply_text(
-                    "❌ Format salah!\n\n"
-                    "Usage: /report <URL>\n"
-                    "Example: /report example.com",
+                    _USAGE_REPORT,
                     parse_mode=None
                 )
                 return
@@ -341,7 +687,7 @@ class BotPresenter:
             await self._generate_pdf_report(update, normalized_url)
             
         except Exception as e:
-            self.logger.error(f"Error in report command: {e}")
+            self.logger.error("Error in report command: %s", e)
             await self._send_error_message(update, "Failed to generate report")
     
     async def handle_reportpdf_command(self, update: Update, context) -> None:
@@ -358,9 +704,7 @@ class BotPresenter:
             # Extract URL from command
             if not context.args:
                 await update.message.reply_text(
-                    "❌ Format salah!\n\n"
-                    "Usage: /reportpdf <URL>\n"
-                    "Example: /reportpdf example.com",
+                    _USAGE_REPORTPDF,
                     parse_mode=None
                 )
                 return
@@ -368,10 +712,12 @@ class BotPresenter:
             url = context.args[0]
             normalized_url = self._normalize_url(url)
             
-            await self._generate_pdf_report(update, normalized_url)
+            # Generate in background; reports from the same chat run in order
+            chat_id = getattr(update.effective_chat, 'id', 0)
+            self._spawn(self._serial(chat_id, self._generate_pdf_report(update, normalized_url)))
             
         except Exception as e:
-            self.logger.error(f"Error in reportpdf command: {e}")
+            self.logger.error("Error in reportpdf command: %s", e)
             await self._send_error_message(update, "Failed to generate PDF report")
     
     async def handle_enter_command(self, update: Update, context) -> None:
@@ -386,17 +732,16 @@ class BotPresenter:
             user_id = getattr(update.effective_user, 'id', 0)
             chat_type = getattr(update.effective_chat, 'type', '')
             
-            if str(user_id) != self.admin_chat_id:
+            if user_id != self._admin_chat_id_int:
                 await update.message.reply_text(
-                    "❌ Akses ditolak!\n\n"
-                    "Perintah ini hanya untuk admin.",
+                    _ADMIN_ONLY_MSG,
                     parse_mode=None
                 )
                 return
             
             if chat_type != 'private':
                 await update.message.reply_text(
-                    "❌ Perintah ini hanya bisa digunakan di private chat!",
+                    _PRIVATE_CHAT_ONLY_MSG,
                     parse_mode=None
                 )
                 return
@@ -404,9 +749,7 @@ class BotPresenter:
             # Extract group URL from command
             if not context.args:
                 await update.message.reply_text(
-                    "❌ Format salah!\n\n"
-                    "Gunakan: /enter <group_url>\n"
-                    "Contoh: /enter https://t.me/c/123456789/5",
+                    _USAGE_ENTER,
                     parse_mode=None
                 )
                 return
@@ -414,11 +757,10 @@ class BotPresenter:
             group_url = context.args[0]
             
             # Parse group URL to extract chat_id and topic_id
-            match = re.match(r'https://t\.me/c/(\d+)/(\d+)', group_url)
+            match = _GROUP_URL_RE.match(group_url)
             if not match:
                 await update.message.reply_text(
-                    "❌ Format URL group tidak valid!\n\n"
-                    "Format yang benar: https://t.me/c/CHAT_ID/TOPIC_ID",
+                    _INVALID_GROUP_URL_MSG,
                     parse_mode=None
                 )
                 return
@@ -426,7 +768,7 @@ class BotPresenter:
             chat_id, topic_id = match.groups()
             
             # Update target topic
-            self.target_topic_id = topic_id
+            self._set_target_topic(topic_id)
             
             await update.message.reply_text(
                 f"✅ Target group successfully updated!\n\n"
@@ -437,7 +779,7 @@ class BotPresenter:
             )
             
         except Exception as e:
-            self.logger.error(f"Error in enter command: {e}")
+            self.logger.error("Error in enter command: %s", e)
             await self._send_error_message(update, "Failed to update target group")
     
     async def handle_private_message(self, update: Update, context) -> None:
@@ -453,7 +795,7 @@ class BotPresenter:
             message_text = getattr(update.message, 'text', '')
             
             # Don't forward admin's own messages
-            if str(user_id) == self.admin_chat_id:
+            if user_id == self._admin_chat_id_int:
                 return
             
             # Forward message to admin
@@ -465,18 +807,25 @@ class BotPresenter:
             )
             
             # Send to admin (this would need actual implementation)
-            self.logger.info(f"Private message from {user_name} ({user_id}): {message_text}")
+            self.logger.info("Private message from %s (%s): %s", user_name, user_id, message_text)
             
             # Send acknowledgment to user
             await update.message.reply_text(
-                "✅ Pesan Anda telah diterima!\n\n"
-                "📨 Pesan telah diteruskan ke admin\n"
-                "⏱️ Admin akan merespons segera.",
+                _MESSAGE_RECEIVED_MSG,
                 parse_mode=None
             )
             
         except Exception as e:
-            self.logger.error(f"Error in private message handler: {e}")
+            self.logger.error("Error in private message handler: %s", e)
+    
+    def _set_target_topic(self, target_topic_id: str) -> None:
+        """Set the target topic ID, keeping its integer form in sync
+        
+        Args:
+            target_topic_id: Target topic ID
+        """
+        self.target_topic_id = str(target_topic_id)
+        self._target_topic_id_int = int(self.target_topic_id) if self.target_topic_id.isdigit() else None
     
     def _is_valid_context(self, update: Update) -> bool:
         """Check if the message is in valid context (correct topic or private chat)
@@ -495,28 +844,33 @@ class BotPresenter:
                 return True
             
             # For group chats, check topic ID
-            if chat_type in ['group', 'supergroup']:
+            if chat_type in _GROUP_TYPES:
                 message_thread_id = getattr(update.message, 'message_thread_id', None)
                 
                 if message_thread_id is None:
                     # No topic specified, reject
                     return False
                 
-                if str(message_thread_id) == self.target_topic_id:
+                if message_thread_id == self._target_topic_id_int:
                     return True
                 else:
-                    # Wrong topic, send error message
-                    asyncio.create_task(update.message.reply_text(
-                        "❌ Bot hanya aktif di topic tertentu!\n\n"
-                    f"📌 Topic yang benar: ID {self.target_topic_id}",
-                    parse_mode=None
-                    ))
+                    # Wrong topic, send error message (at most once per interval per chat)
+                    chat_id = getattr(update.effective_chat, 'id', 0)
+                    now = time.monotonic()
+                    last_warning = self._last_wrong_topic_warning.get(chat_id)
+                    if last_warning is None or now - last_warning >= WRONG_TOPIC_WARNING_INTERVAL:
+                        self._last_wrong_topic_warning[chat_id] = now
+                        self._spawn(update.message.reply_text(
+                            "❌ Bot hanya aktif di topic tertentu!\n\n"
+                            f"📌 Topic yang benar: ID {self.target_topic_id}",
+                            parse_mode=None
+                        ))
                     return False
             
             return False
             
         except Exception as e:
-            self.logger.error(f"Error checking context validity: {e}")
+            self.logger.error("Error checking context validity: %s", e)
             return False
     
     def _normalize_url(self, url: str) -> str:
@@ -528,10 +882,105 @@ class BotPresenter:
         Returns:
             Normalized URL with protocol
         """
-        if not url.startswith(('http://', 'https://')):
+        if not url.startswith(_URL_SCHEMES):
             return f'https://{url}'
         return url
     
+    async def _run_scan(self, url: str, progress_callback=None, force: bool = False) -> ScanResult:
+        """Scan a URL, reusing a recent result for the same URL when available
+        
+        Concurrent requests for the same URL share a single in-flight scan;
+        only the first request's progress callback receives updates.
+        
+        Args:
+            url: Normalized URL to scan
+            progress_callback: Optional callback for scan progress updates
+            force: Ignore any cached result and scan again
+            
+        Returns:
+            Scan result
+        """
+        if force:
+            self.invalidate_scan_cache(url)
+        else:
+            cached = self._get_cached_scan(url)
+            if cached is not None:
+                self.logger.info("Using cached scan result for %s", url)
+                return cached
+        
+        future = self._inflight.get(url)
+        if future is None:
+            # Bounded so a host that stalls the scan can't hold it in flight forever
+            future = asyncio.ensure_future(asyncio.wait_for(
+                self.scanner_service.scan_website(url, progress_callback=progress_callback),
+                SCAN_TIMEOUT
+            ))
+            self._inflight[url] = future
+            future.add_done_callback(partial(self._on_scan_done, url))
+        else:
+            self.logger.info("Joining in-flight scan for %s", url)
+        
+        # Shield the shared scan so one cancelled waiter doesn't cancel it for the others
+        return await asyncio.shield(future)
+    
+    def _on_scan_done(self, url: str, future: 'asyncio.Future[ScanResult]') -> None:
+        """Clear a finished in-flight scan and cache its result
+        
+        Args:
+            url: Normalized URL
+            future: Finished scan future
+        """
+        self._inflight.pop(url, None)
+        if not future.cancelled() and future.exception() is None:
+            self._cache_scan(url, future.result())
+    
+    def _get_cached_scan(self, url: str) -> Optional[ScanResult]:
+        """Get a cached scan result if it has not expired
+        
+        Args:
+            url: Normalized URL
+            
+        Returns:
+            Cached scan result or None
+        """
+        entry = self._scan_cache.get(url)
+        if entry is None:
+            return None
+        
+        cached_at, scan_result = entry
+        if time.monotonic() - cached_at >= SCAN_CACHE_TTL:
+            del self._scan_cache[url]
+            return None
+        
+        self._scan_cache.move_to_end(url)
+        return scan_result
+    
+    def _cache_scan(self, url: str, scan_result: ScanResult) -> None:
+        """Cache a completed scan result, evicting the oldest entries when full
+        
+        Args:
+            url: Normalized URL
+            scan_result: Scan result to cache
+        """
+        if scan_result.status != 'completed':
+            return
+        
+        self._scan_cache[url] = (time.monotonic(), scan_result)
+        self._scan_cache.move_to_end(url)
+        while len(self._scan_cache) > SCAN_CACHE_SIZE:
+            self._scan_cache.popitem(last=False)
+    
+    def invalidate_scan_cache(self, url: Optional[str] = None) -> None:
+        """Drop a cached scan result, or the whole cache
+        
+        Args:
+            url: Normalized URL to drop, or None to clear everything
+        """
+        if url is None:
+            self._scan_cache.clear()
+        else:
+            self._scan_cache.pop(url, None)
+    
     async def _scan_with_progress(self, target_url: str, status_message) -> Optional[ScanResult]:
         """Perform scan with real-time progress updates
         
@@ -543,36 +992,29 @@ class BotPresenter:
             Scan result or None if failed
         """
         try:
-            # Simulate progress updates during scanning
-            await asyncio.sleep(1)
-            await status_message.edit_text(
+            progress_editor = ProgressMessageEditor(status_message)
+            await progress_editor.update(
                 f"🤖 Bot is running...\n"
                 f"🔍 Discovering JavaScript files...\n\n"
-                f"🎯 Target: {target_url}",
-                parse_mode=None
+                f"🎯 Target: {target_url}"
             )
             
-            # Perform actual scan
-            scan_result = await self.scanner_service.scan_website(target_url)
-            
-            # Simulate finding JS files and scanning
-            if scan_result:
-                # Simulate finding files
-                await status_message.edit_text(
+            # Progress is driven by the scanner's own callbacks
+            async def progress_callback(message: str, js_files_count: int = 0):
+                if js_files_count > 0:
+                    status = f"📁 Found {js_files_count} JS files\n🔍 Scanning JavaScript files..."
+                else:
+                    status = f"🔍 {message}"
+                await progress_editor.update(
                     f"🤖 Bot is running...\n"
-                    f"📁 Found 20 JS files\n"
-                    f"🔍 Scanning JavaScript files...\n\n"
-                    f"🎯 Target: {target_url}",
-                    parse_mode=None
+                    f"{status}\n\n"
+                    f"🎯 Target: {target_url}"
                 )
-                
-                # Simulate scanning time
-                await asyncio.sleep(2)
             
-            return scan_result
+            return await self._run_scan(target_url, progress_callback=progress_callback)
             
         except Exception as e:
-            self.logger.error(f"Error in scan with progress: {e}")
+            self.logger.error("Error in scan with progress: %s", e)
             return None
     
 
@@ -602,7 +1044,7 @@ class BotPresenter:
             )
             
         except Exception as e:
-            self.logger.error(f"Error sending scan results: {e}")
+            self.logger.error("Error sending scan results: %s", e)
             await self._send_error_message(update, "Failed to send scan results")
     
     def _format_scan_results(self, scan_result: ScanResult) -> str:
@@ -615,70 +1057,80 @@ class BotPresenter:
             Formatted message string
         """
         try:
-            message = f"📊 Scanning Results\n\n"
-            message += f"🎯 Target: {scan_result.target_url}\n"
-            message += f"⏱️ Duration: {scan_result.scan_duration:.1f} seconds\n\n"
+            parts = [
+                "📊 Scanning Results\n\n",
+                f"🎯 Target: {scan_result.target_url}\n",
+                f"⏱️ Duration: {scan_result.scan_duration:.1f} seconds\n\n"
+            ]
             
             # Credentials section
             if scan_result.credentials:
-                high_risk = [c for c in scan_result.credentials if c.confidence == 'high']
-                medium_risk = [c for c in scan_result.credentials if c.confidence == 'medium']
-                low_risk = [c for c in scan_result.credentials if c.confidence == 'low']
+                # Bucket credentials by risk level in a single pass
+                risk_buckets = {'high': [], 'medium': [], 'low': []}
+                for cred in scan_result.credentials:
+                    bucket = risk_buckets.get(cred.confidence)
+                    if bucket is not None:
+                        bucket.append(cred)
+                high_risk = risk_buckets['high']
+                medium_risk = risk_buckets['medium']
+                low_risk = risk_buckets['low']
                 
-                message += f"🔑 Credentials Found: {len(scan_result.credentials)}\n\n"
+                parts.append(f"🔑 Credentials Found: {len(scan_result.credentials)}\n\n")
                 
-                # High risk credentials (limit to 3)
+                # High risk credentials (limit to 3, truncate long values)
                 if high_risk:
-                    message += "🚨 High Risk:\n"
-                    for i, cred in enumerate(high_risk[:3]):
-                        cred_type = cred.type.replace('_', ' ').title()
-                        # Truncate long values
-                        display_value = cred.value[:50] + '...' if len(cred.value) > 50 else cred.value
-                        message += f"• {cred_type}: {display_value}\n"
+                    parts.append("🚨 High Risk:\n")
+                    parts.extend(
+                        f"• {cred.type.replace('_', ' ').title()}: "
+                        f"{cred.value[:50] + '...' if len(cred.value) > 50 else cred.value}\n"
+                        for cred in high_risk[:3]
+                    )
                     if len(high_risk) > 3:
-                        message += f"• \.\.\. and {len(high_risk) - 3} others\n"
-                    message += "\n"
+                        parts.append(f"• ... and {len(high_risk) - 3} others\n")
+                    parts.append("\n")
                 
                 # Medium risk credentials (limit to 2)
                 if medium_risk:
-                    message += "⚠️ Medium Risk:\n"
-                    for i, cred in enumerate(medium_risk[:2]):
-                        cred_type = cred.type.replace('_', ' ').title()
-                        display_value = cred.value[:30] + '...' if len(cred.value) > 30 else cred.value
-                        message += f"• {cred_type}: {display_value}\n"
+                    parts.append("⚠️ Medium Risk:\n")
+                    parts.extend(
+                        f"• {cred.type.replace('_', ' ').title()}: "
+                        f"{cred.value[:30] + '...' if len(cred.value) > 30 else cred.value}\n"
+                        for cred in medium_risk[:2]
+                    )
                     if len(medium_risk) > 2:
-                        message += f"• \.\.\. and {len(medium_risk) - 2} others\n"
-                    message += "\n"
+                        parts.append(f"• ... and {len(medium_risk) - 2} others\n")
+                    parts.append("\n")
                 
                 # Low risk count only
                 if low_risk:
-                    message += f"ℹ️ Low Risk: {len(low_risk)} item\n\n"
+                    parts.append(f"ℹ️ Low Risk: {len(low_risk)} item\n\n")
                 
-                message += "📄 Use /reportpdf for complete details\n\n"
+                parts.append("📄 Use /reportpdf for complete details\n\n")
             else:
-                message += "✅ No exposed credentials found\n\n"
+                parts.append("✅ No exposed credentials found\n\n")
             
             # Endpoints section
             if scan_result.endpoints:
-                message += f"🌐 Endpoints Found: {len(scan_result.endpoints)}\n"
+                parts.append(f"🌐 Endpoints Found: {len(scan_result.endpoints)}\n")
                 
                 # Show first 3 endpoints
-                for i, endpoint in enumerate(scan_result.endpoints[:3]):
-                    method = endpoint.method
-                    url = endpoint.url[:60] + '...' if len(endpoint.url) > 60 else endpoint.url
-                    message += f"• {method}: {url}\n"
+                parts.extend(
+                    f"• {endpoint.method}: "
+                    f"{endpoint.url[:60] + '...' if len(endpoint.url) > 60 else endpoint.url}\n"
+                    for endpoint in scan_result.endpoints[:3]
+                )
                 
                 if len(scan_result.endpoints) > 3:
-                    message += f"• \.\.\. and {len(scan_result.endpoints) - 3} others\n"
+                    parts.append(f"• ... and {len(scan_result.endpoints) - 3} others\n")
                 
-                message += "\n📄 Use /reportpdf for complete details\n"
+                parts.append("\n📄 Use /reportpdf for complete details\n")
             else:
-                message += "ℹ️ No API endpoints found\n"
+                parts.append("ℹ️ No API endpoints found\n")
             
-            return message
+            return "".join(parts)
             
         except Exception as e:
-            self.logger.error(f"Error formatting scan results: {e}")
+            self.logger.error("Error formatting scan results: %s", e)
             return "❌ Error formatting scan results"
     
     async def _generate_pdf_report(self, update: Update, url: str) -> None:
@@ -689,16 +1141,18 @@ class BotPresenter:
             url: Target URL for scanning
         """
         try:
-            await update.message.reply_text(
-                f"📄 Generating PDF report...\n\n"
-                f"🎯 Target: {url}\n"
-                f"⏱️ Please wait...",
-                parse_mode=None
+            # Notify the user while the scan (reusing a recent result for
+            # the same URL) is already running
+            _, scan_result = await asyncio.gather(
+                update.message.reply_text(
+                    f"📄 Generating PDF report...\n\n"
+                    f"🎯 Target: {url}\n"
+                    f"⏱️ Please wait...",
+                    parse_mode=None
+                ),
+                self._run_scan(url)
             )
             
-            # Perform scan
-            scan_result = await self.scanner_service.scan_website(url)
-            
             if scan_result.status == 'error':
                 await update.message.reply_text(
                     f"❌ Error during scanning:\n\n"
@@ -707,35 +1161,75 @@ class BotPresenter:
                 )
                 return
             
-            # Generate PDF
-            pdf_path = self.pdf_service.generate_report(scan_result)
+            # Generate PDF (reuses an identical earlier report)
+            pdf_bytes = await self._get_report_pdf(scan_result)
             
             # Send PDF file
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            with open(pdf_path, 'rb') as pdf_file:
-                 await update.message.reply_document(
-                     document=pdf_file,
-                     filename=f"security_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-                     caption=(
-                         f"📄 Security Report\n\n"
-                         f"🎯 Target: {url}\n"
-                         f"🔑 Credentials: {len(scan_result.credentials)}\n"
-                         f"🌐 Endpoints: {len(scan_result.endpoints)}\n"
-                         f"📅 Generated: {timestamp}"
-                     ),
-                     parse_mode=None
-                 )
-            
-            # Clean up PDF file
-            try:
-                os.remove(pdf_path)
-            except Exception as e:
-                self.logger.warning(f"Failed to remove PDF file: {e}")
+            generated_at = datetime.now()
+            timestamp = generated_at.strftime('%Y-%m-%d %H:%M:%S')
+            await update.message.reply_document(
+                document=pdf_bytes,
+                filename=f"security_report_{generated_at.strftime('%Y%m%d_%H%M%S')}.pdf",
+                caption=(
+                    f"📄 Security Report\n\n"
+                    f"🎯 Target: {url}\n"
+                    f"🔑 Credentials: {len(scan_result.credentials)}\n"
+                    f"🌐 Endpoints: {len(scan_result.endpoints)}\n"
+                    f"📅 Generated: {timestamp}"
+                ),
+                parse_mode=None
+            )
             
         except Exception as e:
-            self.logger.error(f"Error generating PDF report: {e}")
+            self.logger.error("Error generating PDF report: %s", e)
             await self._send_error_message(update, "Failed to generate PDF report")
     
+    async def _get_report_pdf(self, scan_result: ScanResult) -> bytes:
+        """Render a scan result to PDF bytes, reusing reports of identical findings
+        
+        Args:
+            scan_result: Scan result data
+            
+        Returns:
+            PDF file contents
+        """
+        # Keyed on everything but scan timing, so rescans with the same findings
+        # share it; the TTL bounds how outdated the rendered scan time can get
+        key = hashlib.blake2b(scan_result.findings_bytes(), digest_size=16).hexdigest()
+        entry = self._pdf_cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < PDF_CACHE_TTL:
+            self._pdf_cache.move_to_end(key)
+            self.logger.info("Using cached PDF report for %s", scan_result.target_url)
+            return entry[1]
+        
+        # Render in a worker process; ReportLab layout is CPU-bound and would
+        # otherwise compete with the event loop for the GIL
+        from services.pdf_service import render_report
+        loop = asyncio.get_running_loop()
+        executor = self.pdf_executor
+        try:
+            pdf_bytes = await loop.run_in_executor(executor, render_report, scan_result)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM); replace the pool and retry once. Every render
+            # pending on the broken pool gets here, so only the first replaces it
+            if self._pdf_executor is executor:
+                self.logger.warning("PDF worker pool broke, restarting it")
+                self._reset_pdf_executor()
+            pdf_bytes = await loop.run_in_executor(self.pdf_executor, render_report, scan_result)
+        
+        # Replace an expired entry, or one a concurrent render just stored
+        old = self._pdf_cache.pop(key, None)
+        if old is not None:
+            self._pdf_cache_bytes -= len(old[1])
+        self._pdf_cache[key] = (time.monotonic(), pdf_bytes)
+        self._pdf_cache_bytes += len(pdf_bytes)
+        while self._pdf_cache and (len(self._pdf_cache) > PDF_CACHE_SIZE
+                                   or self._pdf_cache_bytes > PDF_CACHE_MAX_BYTES):
+            _, (_, evicted) = self._pdf_cache.popitem(last=False)
+            self._pdf_cache_bytes -= len(evicted)
+        
+        return pdf_bytes
+    
     async def _send_error_message(self, update: Update, error_msg: str) -> None:
         """Send error message to user
         
@@ -749,4 +1243,4 @@ class BotPresenter:
                 parse_mode=None
             )
         except Exception as e:
-            self.logger.error(f"Failed to send error message: {e}")
\ No newline at end of file
+            self.logger.error("Failed to send error message: %s", e)
\ No newline at end of file
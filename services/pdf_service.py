@@ -6,6 +6,8 @@ Handles PDF report generation for scan results
 
 import os
 from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
 from typing import Optional
 from io import BytesIO
 
@@ -23,14 +25,57 @@ except ImportError:
 
 from models.scan_result import ScanResult
 
+# Findings tables are split into tables of at most this many rows; ReportLab
+# re-splits a table at every page break, which is quadratic for huge tables
+TABLE_CHUNK_ROWS = 100
+
+# Recommendation blocks, pre-joined into single paragraphs
+FINDINGS_RECOMMENDATIONS = "<br/><br/>".join([
+    "1. <b>Immediate Action Required:</b> Remove all exposed credentials from public-facing code and files.",
+    "2. <b>Credential Management:</b> Implement proper environment variable management for sensitive data.",
+    "3. <b>Code Review:</b> Establish code review processes to prevent credential exposure.",
+    "4. <b>Monitoring:</b> Implement automated scanning in CI/CD pipelines.",
+    "5. <b>Access Control:</b> Review and restrict access to sensitive API endpoints.",
+    "6. <b>Rotation:</b> Rotate all exposed credentials immediately."
+])
+
+NO_FINDINGS_RECOMMENDATIONS = "<br/><br/>".join([
+    "1. <b>Maintain Current Practices:</b> Continue following secure coding practices.",
+    "2. <b>Regular Scanning:</b> Perform periodic security scans to maintain security posture.",
+    "3. <b>Team Training:</b> Ensure development team stays updated on security best practices.",
+    "4. <b>Monitoring:</b> Consider implementing automated security scanning in development workflow."
+])
+
+# Table columns read from each finding
+_CRED_ROW = attrgetter('type', 'value', 'source', 'confidence')
+_ENDPOINT_ROW = attrgetter('method', 'url', 'source')
+
+
+@lru_cache(maxsize=128)
+def _format_label(value: str) -> str:
+    """Turn an identifier such as 'api_key' into a display label ('Api Key')
+    
+    Credential types and confidence levels come from a small fixed set, so
+    each label is only formatted once.
+    """
+    return value.replace('_', ' ').title()
+
 
 class PDFReportService:
     """Service for generating PDF reports from scan results"""
     
+    # Color names per confidence level (levels are lowercase, see ScannerService)
+    _RISK_COLORS = {
+        'high': 'red',
+        'medium': 'orange',
+        'low': 'yellow'
+    }
+    
     def __init__(self):
         """Initialize PDF report service"""
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
+        self._setup_table_styles()
     
     def _setup_custom_styles(self) -> None:
         """Setup custom paragraph styles for the report"""
@@ -77,6 +122,41 @@ class PDFReportService:
             spaceAfter=10
         ))
     
+    def _setup_table_styles(self) -> None:
+        """Build the table styles once; they are read-only and shared by every report"""
+        # Scan details table
+        self._details_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+        
+        # First chunk of a findings table, including the header row
+        self._findings_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+        
+        # Continuation chunks of a findings table, body rows only
+        self._findings_body_table_style = TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('BACKGROUND', (0, 0), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+    
     def generate_report(self, scan_result: ScanResult, output_path: Optional[str] = None) -> str:
         """Generate PDF report from scan result
         
@@ -88,16 +168,41 @@ class PDFReportService:
             Path to generated PDF file
         """
         if output_path is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # Microseconds keep concurrently generated reports from sharing a file name
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
             filename = f"recon_report_{timestamp}.pdf"
             output_path = os.path.join(os.getcwd(), "reports", filename)
         
         # Create reports directory if it doesn't exist
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
+        self._build(scan_result, output_path)
+        
+        return output_path
+    
+    def generate_report_bytes(self, scan_result: ScanResult) -> bytes:
+        """Generate PDF report in memory
+        
+        Args:
+            scan_result: Scan result data
+            
+        Returns:
+            PDF file contents
+        """
+        buffer = BytesIO()
+        self._build(scan_result, buffer)
+        return buffer.getvalue()
+    
+    def _build(self, scan_result: ScanResult, target) -> None:
+        """Lay out the report and write it to a file path or binary stream
+        
+        Args:
+            scan_result: Scan result data
+            target: Output file path or writable binary stream
+        """
         # Create PDF document
         doc = SimpleDocTemplate(
-            output_path,
+            target,
             pagesize=A4,
             rightMargin=72,
             leftMargin=72,
@@ -129,10 +234,8 @@ class PDFReportService:
         # Add appendix
         self._add_appendix(story, scan_result)
         
-        # Build PDF
+        # Build PDF (build consumes the story, so rendered chunks are freed as it goes)
         doc.build(story)
-        
-        return output_path
     
     def _add_title_page(self, story: list, scan_result: ScanResult) -> None:
         """Add title page to the report
@@ -146,18 +249,13 @@ class PDFReportService:
         story.append(title)
         story.append(Spacer(1, 0.5*inch))
         
-        # Target information
-        target_info = f"<b>Target:</b> {scan_result.target_url}"
-        story.append(Paragraph(target_info, self.styles['Normal']))
-        story.append(Spacer(1, 0.2*inch))
-        
-        # Scan information
-        scan_info = f"<b>Scan Date:</b> {scan_result.scan_time.strftime('%Y-%m-%d %H:%M:%S')}"
+        # Target, date and duration in a single paragraph
+        scan_info = (
+            f"<b>Target:</b> {scan_result.target_url}<br/><br/>"
+            f"<b>Scan Date:</b> {scan_result.scan_time.strftime('%Y-%m-%d %H:%M:%S')}<br/><br/>"
+            f"<b>Scan Duration:</b> {scan_result.scan_duration:.2f} seconds"
+        )
         story.append(Paragraph(scan_info, self.styles['Normal']))
-        story.append(Spacer(1, 0.2*inch))
-        
-        duration_info = f"<b>Scan Duration:</b> {scan_result.scan_duration:.2f} seconds"
-        story.append(Paragraph(duration_info, self.styles['Normal']))
         story.append(Spacer(1, 0.5*inch))
         
         # Warning notice
@@ -183,19 +281,21 @@ class PDFReportService:
         summary_stats = scan_result.get_summary()
         
         if scan_result.has_findings():
-            summary_text = (
+            parts = [
                 f"The security reconnaissance scan of {scan_result.target_url} "
                 f"identified {summary_stats['total_credentials']} potential credential exposures "
                 f"and {summary_stats['total_endpoints']} API endpoints. "
-            )
+            ]
             
             if summary_stats['high_risk_credentials'] > 0:
-                summary_text += (
+                parts.append(
                     f"<b>Critical:</b> {summary_stats['high_risk_credentials']} high-risk "
                     "credentials were detected that require immediate attention."
                 )
             else:
-                summary_text += "No high-risk credentials were detected."
+                parts.append("No high-risk credentials were detected.")
+            
+            summary_text = "".join(parts)
         else:
             summary_text = (
                 f"The security reconnaissance scan of {scan_result.target_url} "
@@ -229,16 +329,7 @@ class PDFReportService:
             details_data.append(['Error Message', scan_result.error_message])
         
         details_table = Table(details_data, colWidths=[2*inch, 4*inch])
-        details_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        details_table.setStyle(self._details_table_style)
         
         story.append(details_table)
         story.append(Spacer(1, 0.3*inch))
@@ -256,63 +347,70 @@ class PDFReportService:
         if scan_result.credentials:
             story.append(Paragraph("Credential Exposures", self.styles['SectionHeader']))
             
-            cred_data = [['Type', 'Value', 'Source', 'Risk Level']]
-            
-            for cred in scan_result.credentials:
-                # Display full values without masking
-                risk_color = self._get_risk_color(cred.confidence)
-                
-                cred_data.append([
-                    cred.type.replace('_', ' ').title(),
-                    cred.value,
-                    cred.source,
-                    cred.confidence.title()
-                ])
-            
-            cred_table = Table(cred_data, colWidths=[1.5*inch, 2*inch, 2*inch, 1*inch])
-            cred_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
+            # Display full values without masking
+            cred_rows = [
+                [_format_label(cred_type), value, source, _format_label(confidence)]
+                for cred_type, value, source, confidence in map(_CRED_ROW, scan_result.credentials)
+            ]
             
-            story.append(cred_table)
+            self._add_findings_table(
+                story,
+                ['Type', 'Value', 'Source', 'Risk Level'],
+                cred_rows,
+                [1.5*inch, 2*inch, 2*inch, 1*inch],
+                # Highlight the risk level cell by confidence
+                [self._RISK_COLORS.get(cred.confidence) for cred in scan_result.credentials]
+            )
             story.append(Spacer(1, 0.3*inch))
         
         # Endpoints section
         if scan_result.endpoints:
             story.append(Paragraph("API Endpoints", self.styles['SectionHeader']))
             
-            endpoint_data = [['Method', 'URL', 'Source']]
+            endpoint_rows = list(map(list, map(_ENDPOINT_ROW, scan_result.endpoints)))
             
-            for endpoint in scan_result.endpoints:
-                endpoint_data.append([
-                    endpoint.method,
-                    endpoint.url,
-                    endpoint.source
-                ])
+            self._add_findings_table(
+                story,
+                ['Method', 'URL', 'Source'],
+                endpoint_rows,
+                [1*inch, 3.5*inch, 2*inch]
+            )
+            story.append(Spacer(1, 0.3*inch))
+    
+    def _add_findings_table(self, story: list, header: list, rows: list, col_widths: list,
+                            last_column_colors: Optional[list] = None) -> None:
+        """Add a findings table as consecutive chunks of TABLE_CHUNK_ROWS rows
+        
+        Args:
+            story: PDF story elements
+            header: Column titles, shown above the first chunk
+            rows: Table rows
+            col_widths: Column widths shared by every chunk
+            last_column_colors: Optional background color per row for the last
+                column (None leaves the cell unchanged)
+        """
+        for start in range(0, len(rows), TABLE_CHUNK_ROWS):
+            end = start + TABLE_CHUNK_ROWS
+            chunk = rows[start:end]
+            
+            if start == 0:
+                table = Table([header] + chunk, colWidths=col_widths)
+                table.setStyle(self._findings_table_style)
+                first_row = 1
+            else:
+                # Continuation chunks carry only body rows
+                table = Table(chunk, colWidths=col_widths)
+                table.setStyle(self._findings_body_table_style)
+                first_row = 0
             
-            endpoint_table = Table(endpoint_data, colWidths=[1*inch, 3.5*inch, 2*inch])
-            endpoint_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
+            if last_column_colors:
+                table.setStyle([
+                    ('BACKGROUND', (-1, row), (-1, row), color)
+                    for row, color in enumerate(last_column_colors[start:end], first_row)
+                    if color is not None
+                ])
             
-            story.append(endpoint_table)
-            story.append(Spacer(1, 0.3*inch))
+            story.append(table)
     
     def _add_no_findings_section(self, story: list) -> None:
         """Add section for when no findings are detected
@@ -342,28 +440,14 @@ class PDFReportService:
         """
         story.append(Paragraph("Recommendations", self.styles['CustomSubtitle']))
         
+        # One paragraph per block keeps the flowable count (and layout work) low
         if scan_result.has_findings():
-            recommendations = [
-                "1. <b>Immediate Action Required:</b> Remove all exposed credentials from public-facing code and files.",
-                "2. <b>Credential Management:</b> Implement proper environment variable management for sensitive data.",
-                "3. <b>Code Review:</b> Establish code review processes to prevent credential exposure.",
-                "4. <b>Monitoring:</b> Implement automated scanning in CI/CD pipelines.",
-                "5. <b>Access Control:</b> Review and restrict access to sensitive API endpoints.",
-                "6. <b>Rotation:</b> Rotate all exposed credentials immediately."
-            ]
+            recommendations = FINDINGS_RECOMMENDATIONS
         else:
-            recommendations = [
-                "1. <b>Maintain Current Practices:</b> Continue following secure coding practices.",
-                "2. <b>Regular Scanning:</b> Perform periodic security scans to maintain security posture.",
-                "3. <b>Team Training:</b> Ensure development team stays updated on security best practices.",
-                "4. <b>Monitoring:</b> Consider implementing automated security scanning in development workflow."
-            ]
-        
-        for rec in recommendations:
-            story.append(Paragraph(rec, self.styles['Normal']))
-            story.append(Spacer(1, 0.1*inch))
+            recommendations = NO_FINDINGS_RECOMMENDATIONS
         
-        story.append(Spacer(1, 0.3*inch))
+        story.append(Paragraph(recommendations, self.styles['Normal']))
+        story.append(Spacer(1, 0.4*inch))
     
     def _add_appendix(self, story: list, scan_result: ScanResult) -> None:
         """Add appendix with technical details
@@ -397,21 +481,25 @@ class PDFReportService:
         )
         
         story.append(Paragraph(disclaimer_text, self.styles['Normal']))
-    
 
+
+# Service instance of the current (worker) process, created on first use
+_worker_service: Optional[PDFReportService] = None
+
+
+def render_report(scan_result: ScanResult) -> bytes:
+    """Render a scan result to PDF bytes with a process-local service
     
-    def _get_risk_color(self, confidence: str) -> str:
-        """Get color for risk level
-        
-        Args:
-            confidence: Confidence level
-            
-        Returns:
-            Color name
-        """
-        color_map = {
-            'high': 'red',
-            'medium': 'orange',
-            'low': 'yellow'
-        }
-        return color_map.get(confidence.lower(), 'black')
\ No newline at end of file
+    Module-level so it can be submitted to a ProcessPoolExecutor, which keeps
+    CPU-bound ReportLab layout off the bot process's GIL.
+    
+    Args:
+        scan_result: Scan result data
+        
+    Returns:
+        PDF file contents
+    """
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = PDFReportService()
+    return _worker_service.generate_report_bytes(scan_result)
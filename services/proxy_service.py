@@ -6,28 +6,115 @@ Handles proxy rotation and management for avoiding rate limits
 
 import asyncio
 import aiohttp
+import orjson
 import random
+from collections import deque
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
+import os
+
+# Default location of the on-disk proxy list cache
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'recon-bot', 'proxies.json')
+
+# Random draws from the full proxy list before falling back to scanning the working set
+RANDOM_PROXY_ATTEMPTS = 8
+
+# aiodns lets aiohttp resolve hostnames without a thread pool
+try:
+    import aiodns  # noqa: F401
+    HAS_AIODNS = True
+except ImportError:
+    HAS_AIODNS = False
 
 
 class ProxyService:
     """Service class for proxy management and rotation"""
     
-    def __init__(self, proxy_api_url: str = "https://proxylist.geonode.com/api/proxy-list"):
+    def __init__(self, proxy_api_url: str = "https://proxylist.geonode.com/api/proxy-list",
+                 cache_path: Optional[str] = DEFAULT_CACHE_PATH):
         """Initialize proxy service
         
         Args:
             proxy_api_url: URL to fetch proxy list from
+            cache_path: File the last fetched proxy list is persisted to, or None to disable
         """
         self.proxy_api_url = proxy_api_url
+        self.cache_path = cache_path
         self.proxies: List[Dict] = []
-        self.current_proxy_index = 0
+        self._proxy_by_url: Dict[str, Dict] = {}
+        self._working: deque = deque()  # Proxies not marked as failed, in rotation order
         self.failed_proxies: set = set()
         self.last_fetch_time: Optional[datetime] = None
         self.fetch_interval = timedelta(minutes=30)  # Refresh proxies every 30 minutes
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        # Validators of the last accepted proxy list, for conditional refreshes
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
         self.logger = logging.getLogger(__name__)
+        self._load_cache()
+    
+    def _load_cache(self) -> None:
+        """Restore the proxy list persisted by a previous run, if any"""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        
+        try:
+            with open(self.cache_path, 'rb') as f:
+                cached = orjson.loads(f.read())
+            
+            self._set_proxies(cached['proxies'])
+            self.last_fetch_time = datetime.fromisoformat(cached['last_fetch'])
+            self._etag = cached.get('etag')
+            self._last_modified = cached.get('last_modified')
+            self.logger.info(f"✅ Loaded {len(self.proxies)} cached proxies")
+        except Exception as e:
+            self.logger.warning(f"⚠️ Ignoring unreadable proxy cache: {e}")
+    
+    def _save_cache(self) -> None:
+        """Persist the current proxy list so a restart can skip the cold fetch"""
+        if not self.cache_path:
+            return
+        
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path, 'wb') as f:
+                f.write(orjson.dumps({
+                    'proxies': self.proxies,
+                    'last_fetch': self.last_fetch_time.isoformat(),
+                    'etag': self._etag,
+                    'last_modified': self._last_modified
+                }))
+        except Exception as e:
+            self.logger.warning(f"⚠️ Failed to save proxy cache: {e}")
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session for the proxy API, creating it on first use
+        
+        Returns:
+            ClientSession: Shared HTTP session
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=50,
+                ttl_dns_cache=300,
+                resolver=aiohttp.AsyncResolver() if HAS_AIODNS else None
+            )
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10),
+                connector=connector
+            )
+        return self._session
+    
+    async def close(self) -> None:
+        """Stop any background refresh and close the shared HTTP session"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
         
     async def fetch_proxies(self) -> bool:
         """Fetch fresh proxy list from API
@@ -36,85 +123,106 @@ class ProxyService:
             True if proxies were fetched successfully, False otherwise
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.proxy_api_url, timeout=10) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        # Filter working proxies
-                        working_proxies = []
-                        for proxy in data.get('data', []):
-                            # Only use proxies with high uptime and low latency
-                            if (proxy.get('upTime', 0) > 80 and 
-                                proxy.get('latency', 1000) < 500 and
-                                'socks4' in proxy.get('protocols', [])):
-                                
-                                proxy_url = f"socks4://{proxy['ip']}:{proxy['port']}"
-                                working_proxies.append({
-                                    'url': proxy_url,
-                                    'ip': proxy['ip'],
-                                    'port': proxy['port'],
-                                    'country': proxy.get('country', 'Unknown'),
-                                    'uptime': proxy.get('upTime', 0),
-                                    'latency': proxy.get('latency', 0)
-                                })
+            # Ask for the list only if it changed since the last accepted fetch
+            headers = {}
+            if self.proxies:
+                if self._etag:
+                    headers['If-None-Match'] = self._etag
+                if self._last_modified:
+                    headers['If-Modified-Since'] = self._last_modified
+            
+            session = self._get_session()
+            async with session.get(self.proxy_api_url, headers=headers) as response:
+                if response.status == 304 and self.proxies:
+                    # Unchanged upstream: keep the list, restart its refresh period
+                    self._set_proxies(self.proxies)
+                    await asyncio.to_thread(self._save_cache)
+                    self.logger.info("✅ Proxy list unchanged")
+                    return True
+                elif response.status == 200:
+                    data = orjson.loads(await response.read())
+                    
+                    # Filter working proxies: only high uptime, low latency SOCKS4
+                    working_proxies = [
+                        {
+                            'url': f"socks4://{proxy_key}",
+                            'key': proxy_key,
+                            'ip': proxy['ip'],
+                            'port': proxy['port'],
+                            'country': proxy.get('country', 'Unknown'),
+                            'uptime': proxy['upTime'],
+                            'latency': proxy['latency']
+                        }
+                        for proxy in data.get('data', ())
+                        if (proxy.get('upTime', 0) > 80 and
+                            proxy.get('latency', 1000) < 500 and
+                            'socks4' in proxy.get('protocols', ()))
+                        for proxy_key in (f"{proxy['ip']}:{proxy['port']}",)
+                    ]
+                    
+                    if working_proxies:
+                        self._set_proxies(working_proxies)
+                        self._etag = response.headers.get('ETag')
+                        self._last_modified = response.headers.get('Last-Modified')
+                        await asyncio.to_thread(self._save_cache)
                         
-                        if working_proxies:
-                            self.proxies = working_proxies
-                            self.last_fetch_time = datetime.now()
-                            self.failed_proxies.clear()
-                            self.current_proxy_index = 0
-                            
-                            self.logger.info(f"✅ Fetched {len(working_proxies)} working proxies")
-                            return True
-                        else:
-                            self.logger.warning("⚠️ No working proxies found in API response")
-                            return False
+                        self.logger.info(f"✅ Fetched {len(working_proxies)} working proxies")
+                        return True
                     else:
-                        self.logger.error(f"❌ Failed to fetch proxies: HTTP {response.status}")
+                        self.logger.warning("⚠️ No working proxies found in API response")
                         return False
-                        
+                else:
+                    self.logger.error(f"❌ Failed to fetch proxies: HTTP {response.status}")
+                    return False
+                    
         except Exception as e:
             self.logger.error(f"❌ Error fetching proxies: {e}")
             return False
     
+    def _set_proxies(self, proxies: List[Dict]) -> None:
+        """Install a freshly fetched proxy list and reset failure tracking
+        
+        Args:
+            proxies: Filtered proxy records
+        """
+        self.proxies = proxies
+        self._proxy_by_url = {proxy['url']: proxy for proxy in proxies}
+        self.last_fetch_time = datetime.now()
+        self.failed_proxies.clear()
+        self._working = deque(proxies)
+    
+    def _schedule_refresh(self) -> None:
+        """Start a background proxy list refresh unless one is already running"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self.fetch_proxies())
+    
     async def get_proxy(self) -> Optional[str]:
         """Get next available proxy
         
         Returns:
             Proxy URL string or None if no proxies available
         """
-        # Check if we need to refresh proxies
-        if (not self.proxies or 
-            not self.last_fetch_time or 
-            datetime.now() - self.last_fetch_time > self.fetch_interval):
-            
+        if not self.proxies:
+            # Cold start: nothing to hand out until the first fetch completes
             await self.fetch_proxies()
+        elif (not self.last_fetch_time or
+              datetime.now() - self.last_fetch_time > self.fetch_interval):
+            # Stale list: keep serving it while a refresh runs in the background
+            self._schedule_refresh()
         
         # If still no proxies, return None
         if not self.proxies:
             return None
         
-        # Find next working proxy
-        attempts = 0
-        while attempts < len(self.proxies):
-            proxy = self.proxies[self.current_proxy_index]
-            proxy_key = f"{proxy['ip']}:{proxy['port']}"
-            
-            # Skip failed proxies
-            if proxy_key not in self.failed_proxies:
-                return proxy['url']
-            
-            # Move to next proxy
-            self.current_proxy_index = (self.current_proxy_index + 1) % len(self.proxies)
-            attempts += 1
-        
         # All proxies failed, clear failed list and try again
-        self.failed_proxies.clear()
-        if self.proxies:
-            return self.proxies[0]['url']
+        if not self._working:
+            self.failed_proxies.clear()
+            self._working = deque(self.proxies)
         
-        return None
+        # Hand out the head and move it to the back of the rotation
+        proxy = self._working[0]
+        self._working.rotate(-1)
+        return proxy['url']
     
     def mark_proxy_failed(self, proxy_url: str) -> None:
         """Mark a proxy as failed
@@ -122,12 +230,13 @@ class ProxyService:
         Args:
             proxy_url: The proxy URL that failed
         """
-        for proxy in self.proxies:
-            if proxy['url'] == proxy_url:
-                proxy_key = f"{proxy['ip']}:{proxy['port']}"
+        proxy = self._proxy_by_url.get(proxy_url)
+        if proxy is not None:
+            proxy_key = proxy['key']
+            if proxy_key not in self.failed_proxies:
                 self.failed_proxies.add(proxy_key)
-                self.logger.warning(f"⚠️ Marked proxy as failed: {proxy_key}")
-                break
+                self._working.remove(proxy)
+            self.logger.warning(f"⚠️ Marked proxy as failed: {proxy_key}")
     
     def get_random_proxy(self) -> Optional[str]:
         """Get a random proxy from available list
@@ -135,20 +244,17 @@ class ProxyService:
         Returns:
             Random proxy URL or None if no proxies available
         """
-        if not self.proxies:
+        if not self._working:
             return None
         
-        # Filter out failed proxies
-        working_proxies = []
-        for proxy in self.proxies:
-            proxy_key = f"{proxy['ip']}:{proxy['port']}"
-            if proxy_key not in self.failed_proxies:
-                working_proxies.append(proxy)
-        
-        if working_proxies:
-            return random.choice(working_proxies)['url']
+        # Indexing the proxy list is O(1), unlike the deque, so draw from it and
+        # skip failed proxies; only when most have failed use the working deque
+        for _ in range(RANDOM_PROXY_ATTEMPTS):
+            proxy = random.choice(self.proxies)
+            if proxy['key'] not in self.failed_proxies:
+                return proxy['url']
         
-        return None
+        return random.choice(self._working)['url']
     
     def get_proxy_stats(self) -> Dict:
         """Get proxy statistics
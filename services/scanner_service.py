@@ -6,10 +6,13 @@ Handles website scanning operations and credential detection
 
 import re
 import asyncio
+import html
+import math
+import random
 import aiohttp
-from typing import Dict, List, Any, Optional
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+from urllib.parse import urljoin
 from datetime import datetime
 import time
 import logging
@@ -17,10 +20,93 @@ import logging
 from models.scan_result import ScanResult, CredentialMatch, EndpointMatch
 from services.proxy_service import ProxyService
 
+# Progress messages, already escaped for MarkdownV2
+_PROGRESS_START_TPL = "🎯 *Starting website scan:* `{}`"
+_PROGRESS_DIRECT = r"🔄 *Menggunakan koneksi langsung tanpa proxy\.\.\.*"
+_PROGRESS_MAIN_PAGE = r"📄 *Scanning main page\.\.\.*"
+_PROGRESS_JS_SEARCH = r"🔍 *Searching for JavaScript files\.\.\.*"
+_PROGRESS_JS_FOUND_TPL = "📄 *JS files found:* {} files"
+_PROGRESS_CREDENTIALS = r"🔍 *Searching for credentials\.\.\.*"
+_PROGRESS_NO_JS = "ℹ️ *No JavaScript files found*"
+_PROGRESS_COMPLETED_TPL = (
+    "✅ *Scan completed\\!*\n"
+    "🔑 Credentials found: *{}*\n"
+    "🌐 Endpoints found: *{}*\n"
+    "⏱️ Duration: *{} seconds*"
+)
+_PROGRESS_CANCELLED = "❌ *Scan cancelled*"
+
+# src attribute of <script> tags, double-quoted, single-quoted or bare
+_SCRIPT_SRC_RE = re.compile(
+    r"""<script\b[^>]*?\ssrc\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""",
+    re.IGNORECASE
+)
+
+# Concurrent fetches across all scans, matched to the connector's per-host limit
+MAX_CONCURRENT_FETCHES = 30
+
+# Worker tasks fetching and scanning one scan's JavaScript files
+JS_SCAN_WORKERS = 16
+
+# Threads running content analysis off the event loop
+ANALYSIS_WORKERS = 4
+
+# Longest Retry-After delay honored before retrying a throttled request, in seconds
+MAX_RETRY_AFTER = 30
+
+# Chunk size for bounded streaming reads of fetched files
+READ_CHUNK_SIZE = 64 * 1024
+
+# google-re2 can test the whole credential pattern set in one linear-time pass
+try:
+    import re2
+    HAS_RE2 = True
+except ImportError:
+    HAS_RE2 = False
+
+# Memory budget for the RE2 pattern set's DFA (it reports no matches if exceeded)
+RE2_MAX_MEM = 64 * 1024 * 1024
+
+
+def _re2_pattern(pattern: str) -> str:
+    """Rewrite a pattern so RE2 matches it like Python does on ASCII text
+    
+    RE2's \\s leaves out the vertical tab that Python's includes.
+    
+    Args:
+        pattern: Python regex pattern
+        
+    Returns:
+        str: Equivalent RE2 pattern
+    """
+    out = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        if pattern[i] == '\\':
+            escape = pattern[i:i + 2]
+            if escape == r'\s':
+                escape = r'\s\v' if in_class else r'[\s\v]'
+            out.append(escape)
+            i += 2
+            continue
+        if pattern[i] == '[':
+            in_class = True
+        elif pattern[i] == ']':
+            in_class = False
+        out.append(pattern[i])
+        i += 1
+    return ''.join(out)
+
 
 class ScannerService:
     """Service class for website scanning operations"""
     
+    # Credential types reported as high confidence regardless of value length
+    _HIGH_CONFIDENCE_TYPES = frozenset({
+        'firebase_key', 'awsKey', 'aws_key', 'github_token', 'googleApi', 'jwt_token'
+    })
+    
     def __init__(self, max_file_size: int = 5 * 1024 * 1024, request_timeout: int = 30, use_proxy: bool = True, progress_callback=None):
         """Initialize scanner service
         
@@ -35,6 +121,9 @@ class ScannerService:
         self.use_proxy = use_proxy
         self.progress_callback = progress_callback
         self.proxy_service = ProxyService() if use_proxy else None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._sem = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+        self._analysis_executor: Optional[ThreadPoolExecutor] = None
         self.logger = logging.getLogger(__name__)
         
         # Credential patterns for detection
@@ -88,9 +177,101 @@ class ScannerService:
             r'["\']\s*(/v\d+/[^"\s]+)["\']',
             r'["\']\s*(https?://[^"\s]+/api/[^"\s]+)["\']',
             r'fetch\s*\(["\']([^"\s]+)["\']',
-            r'axios\.[get|post|put|delete]+\s*\(["\']([^"\s]+)["\']',
+            r'axios\.(?:get|post|put|delete|patch)\s*\(["\']([^"\s]+)["\']',
             r'\$\.ajax\s*\([^{]*url\s*:\s*["\']([^"\s]+)["\']'
         ]
+        
+        # Literals (lowercase) at least one of which every pattern of a credential
+        # type contains; types whose literals are absent from a file are skipped
+        self.credential_hints = {
+            'apiKey': ('key',),
+            'googleApi': ('aiza',),
+            'secret_key': ('secret',),
+            'access_token': ('access',),
+            'firebase_key': ('aiza',),
+            'awsKey': ('akia',),
+            'github_token': ('ghp_', 'github_pat_'),
+            'jwt_token': ('eyj',)
+        }
+        
+        # Compile every pattern once instead of on each line scanned
+        self._compiled_credential_patterns: Dict[str, List[re.Pattern]] = {
+            cred_type: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for cred_type, patterns in self.credential_patterns.items()
+        }
+        self._compiled_endpoint_patterns: List[re.Pattern] = [
+            re.compile(pattern, re.IGNORECASE) for pattern in self.endpoint_patterns
+        ]
+        self._flat_credential_patterns = [
+            (cred_type, pattern)
+            for cred_type, patterns in self._compiled_credential_patterns.items()
+            for pattern in patterns
+        ]
+        self._credential_set = self._build_credential_set() if HAS_RE2 else None
+        # One pass over a file finds every hint literal it contains (the
+        # lookahead lets overlapping hints, as in "keyJ...", all be seen)
+        all_hints = sorted({hint for hints in self.credential_hints.values() for hint in hints})
+        self._credential_hint_re = re.compile(
+            '(?=(%s))' % '|'.join(map(re.escape, all_hints)), re.IGNORECASE
+        )
+        self._md_special = re.compile(r'([_*\[\]()~`>#+=|{}.!-])')
+        # Absolute http(s) URL with a host and no whitespace; matched with fullmatch
+        self._url_re = re.compile(r'https?://[^\s/$.?#][^\s]*', re.IGNORECASE)
+        # First HTTP method named as a whole word
+        self._method_re = re.compile(r'\b(POST|PUT|DELETE|PATCH|GET)\b', re.IGNORECASE)
+        # Static asset extensions that end a path, before any query or fragment
+        self._fp_re = re.compile(
+            r'\.(?:css|js|png|jpe?g|gif|svg|ico|woff|ttf|eot|map)(?:$|[?#])', re.IGNORECASE
+        )
+    
+    def _build_credential_set(self):
+        """Compile all credential patterns into one RE2 set
+        
+        Set IDs follow the order of _flat_credential_patterns.
+        
+        Returns:
+            re2.Set or None if any pattern is unsupported by RE2
+        """
+        options = re2.Options()
+        options.case_sensitive = False
+        options.max_mem = RE2_MAX_MEM
+        credential_set = re2.Set.SearchSet(options)
+        
+        try:
+            for _, pattern in self._flat_credential_patterns:
+                credential_set.Add(_re2_pattern(pattern.pattern))
+            credential_set.Compile()
+        except re2.error as e:
+            self.logger.warning(f"⚠️ RE2 pattern set unavailable, using re only: {e}")
+            return None
+        return credential_set
+    
+    def _credential_candidates(self, content: str) -> List[Tuple[str, re.Pattern]]:
+        """Narrow the credential patterns to those that can match content
+        
+        Args:
+            content: Content to search
+            
+        Returns:
+            List of (credential type, pattern) pairs in declaration order
+        """
+        # Both prefilters are only sound for ASCII text: re's IGNORECASE also
+        # folds characters such as 'ſ' onto ASCII letters, which neither
+        # RE2 nor the lowercased hints account for
+        if not content.isascii():
+            return self._flat_credential_patterns
+        
+        if self._credential_set is not None:
+            # An empty result can also mean the DFA ran out of memory, so only
+            # trust a non-empty one and otherwise fall back to the hints
+            matched = self._credential_set.Match(content)
+            if matched:
+                return [self._flat_credential_patterns[i] for i in sorted(matched)]
+        
+        present = {hint.lower() for hint in self._credential_hint_re.findall(content)}
+        return [(cred_type, pattern)
+                for cred_type, pattern in self._flat_credential_patterns
+                if not present.isdisjoint(self.credential_hints[cred_type])]
     
     def _escape_markdown_v2(self, text: str) -> str:
         """
@@ -103,8 +284,7 @@ class ScannerService:
             Escaped text safe for MarkdownV2
         """
         # Escape all MarkdownV2 special characters
-        special_chars = r'([_*\[\]()~`>#+=|{}.!-])'
-        return re.sub(special_chars, r'\\\1', text)
+        return self._md_special.sub(r'\\\1', text)
     
     def normalize_url(self, url: str) -> str:
         """Normalize URL by adding protocol if missing
@@ -128,11 +308,7 @@ class ScannerService:
         Returns:
             True if URL is valid, False otherwise
         """
-        try:
-            result = urlparse(url)
-            return all([result.scheme, result.netloc])
-        except Exception:
-            return False
+        return self._url_re.fullmatch(url) is not None
     
     async def _create_session_without_proxy(self) -> aiohttp.ClientSession:
         """Create aiohttp session for direct connection without proxy
@@ -141,7 +317,14 @@ class ScannerService:
             ClientSession: HTTP session for direct connection
         """
         timeout = aiohttp.ClientTimeout(total=self.request_timeout)
-        connector = aiohttp.TCPConnector(limit=100, limit_per_host=30)
+        # Cache DNS answers and keep idle connections long enough for one scan's
+        # page and script fetches to reuse them
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=MAX_CONCURRENT_FETCHES,
+            ttl_dns_cache=300,
+            keepalive_timeout=30
+        )
         session = aiohttp.ClientSession(
             timeout=timeout, 
             connector=connector,
@@ -152,66 +335,153 @@ class ScannerService:
         
         return session
     
-    async def _make_request_with_retry(self, url: str, max_retries: int = 3) -> Optional[str]:
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use
+        
+        The session is reused across requests and scans so pooled
+        keep-alive connections skip repeated TCP and TLS handshakes.
+        
+        Returns:
+            ClientSession: Shared HTTP session
+        """
+        if self._session is None or self._session.closed:
+            self._session = await self._create_session_without_proxy()
+        return self._session
+    
+    @property
+    def analysis_executor(self) -> ThreadPoolExecutor:
+        """Thread pool for content analysis, started on first use"""
+        if self._analysis_executor is None:
+            self._analysis_executor = ThreadPoolExecutor(
+                max_workers=ANALYSIS_WORKERS, thread_name_prefix='scan-analysis'
+            )
+        return self._analysis_executor
+    
+    async def close(self) -> None:
+        """Close the shared HTTP sessions and the analysis thread pool"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self._analysis_executor is not None:
+            self._analysis_executor.shutdown(wait=False, cancel_futures=True)
+            self._analysis_executor = None
+        if self.proxy_service is not None:
+            await self.proxy_service.close()
+    
+    async def _make_request_with_retry(self, session: aiohttp.ClientSession, url: str,
+                                       max_retries: int = 3, max_bytes: Optional[int] = None) -> Optional[str]:
         """Make HTTP request with retry logic without proxy
         
         Args:
+            session: HTTP session shared by the scan
             url: URL to request
             max_retries: Maximum number of retries
+            max_bytes: Body size limit; larger responses are abandoned unread
             
         Returns:
             Response text content or None if failed
         """
         for attempt in range(max_retries):
-            session = None
             try:
-                session = await self._create_session_without_proxy()
-                
                 async with session.get(url, timeout=aiohttp.ClientTimeout(total=self.request_timeout)) as response:
                     if response.status == 200:
-                        content = await response.text()
+                        if max_bytes is None:
+                            content = await response.text()
+                        else:
+                            content = await self._read_bounded(response, max_bytes)
+                            if content is None:
+                                self.logger.warning(f"Response too large, skipped: {url}")
+                                return None
                         self.logger.info(f"Successfully fetched {url} on attempt {attempt + 1}")
                         return content
-                    elif response.status in [403, 429, 503]:  # Rate limiting or blocking
-                        self.logger.warning(f"Blocked (HTTP {response.status}) on attempt {attempt + 1} for {url}")
-                        await asyncio.sleep(2 ** attempt)  # Exponential backoff
-                        continue
+                    elif response.status in (429, 503):  # Rate limiting
+                        self.logger.warning(f"Throttled (HTTP {response.status}) on attempt {attempt + 1} for {url}")
+                        delay = self._retry_after(response, attempt)
+                    elif response.status == 403:  # Blocking
+                        self.logger.warning(f"Blocked (HTTP 403) on attempt {attempt + 1} for {url}")
+                        delay = 2 ** attempt  # Exponential backoff
                     else:
                         self.logger.warning(f"HTTP {response.status} for {url}")
                         return None
                         
             except asyncio.TimeoutError:
                 self.logger.warning(f"Timeout on attempt {attempt + 1} for {url}")
-                await asyncio.sleep(2 ** attempt)  # Exponential backoff
-                continue
+                delay = 2 ** attempt  # Exponential backoff
+            except aiohttp.ClientConnectorError as e:
+                self.logger.warning(f"Connection failed on attempt {attempt + 1} for {url}: {str(e)}")
+                # Jittered so concurrent fetches to a flaky host don't retry in lockstep
+                delay = random.uniform(0, 2 ** attempt)
             except Exception as e:
                 self.logger.warning(f"Error on attempt {attempt + 1} for {url}: {str(e)}")
-                await asyncio.sleep(2 ** attempt)  # Exponential backoff
-                continue
-            finally:
-                if session and not session.closed:
-                    await session.close()
+                delay = 2 ** attempt  # Exponential backoff
+            
+            # Wait outside the response context so the connection returns to the pool
+            await asyncio.sleep(delay)
                     
         self.logger.error(f"Failed to fetch {url} after {max_retries} attempts")
         return None
     
-    async def _send_progress_update(self, message: str) -> None:
+    async def _read_bounded(self, response: aiohttp.ClientResponse, max_bytes: int) -> Optional[str]:
+        """Read a response body, giving up as soon as it exceeds a size limit
+        
+        Args:
+            response: Response to read
+            max_bytes: Maximum body size in bytes
+            
+        Returns:
+            Decoded body or None if it is larger than max_bytes
+        """
+        if (response.content_length or 0) > max_bytes:
+            return None
+        
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+            body += chunk
+            if len(body) > max_bytes:
+                return None
+        
+        return body.decode(response.charset or 'utf-8', errors='replace')
+    
+    def _retry_after(self, response: aiohttp.ClientResponse, attempt: int) -> float:
+        """Get how long to wait before retrying a throttled request
+        
+        Args:
+            response: Throttled response
+            attempt: Zero-based attempt number
+            
+        Returns:
+            float: Delay in seconds, from Retry-After when given in seconds
+        """
+        try:
+            delay = float(response.headers.get('Retry-After', 2 ** attempt))
+        except ValueError:  # HTTP-date form
+            delay = 2 ** attempt
+        # nan and inf would slip through min/max and make sleep() never return
+        if not math.isfinite(delay):
+            delay = 2 ** attempt
+        return min(max(delay, 0), MAX_RETRY_AFTER)
+    
+    async def _send_progress_update(self, message: str, progress_callback=None) -> None:
         """Send progress update via callback if available
         
         Args:
             message: Progress message to send
+            progress_callback: Per-scan callback overriding the instance callback
         """
-        if self.progress_callback:
+        callback = progress_callback or self.progress_callback
+        if callback:
             try:
-                await self.progress_callback(message)
+                await callback(message)
             except Exception as e:
                 self.logger.warning(f"Failed to send progress update: {e}")
     
-    async def scan_website(self, url: str) -> ScanResult:
+    async def scan_website(self, url: str, progress_callback=None) -> ScanResult:
         """Scan website for credentials and endpoints with interactive progress
         
         Args:
             url: Target URL to scan
+            progress_callback: Optional callback for this scan's progress updates,
+                so concurrent scans sharing this service don't overwrite each other
             
         Returns:
             ScanResult object containing findings
@@ -220,27 +490,34 @@ class ScannerService:
         normalized_url = self.normalize_url(url)
         
         # Send initial progress update
-        await self._send_progress_update(f"🎯 *Starting website scan:* `{self._escape_markdown_v2(normalized_url)}`")
+        await self._send_progress_update(
+            _PROGRESS_START_TPL.format(self._escape_markdown_v2(normalized_url)), progress_callback
+        )
         
         scan_result = ScanResult(
             target_url=normalized_url,
-            scan_time=datetime.now(),
-            credentials=[],
-            endpoints=[]
+            scan_time=datetime.now()
         )
         
         try:
             # Skip proxy initialization - using direct connection
-            await self._send_progress_update("🔄 *Menggunakan koneksi langsung tanpa proxy\.\.\.\*")
+            await self._send_progress_update(_PROGRESS_DIRECT, progress_callback)
             self.logger.info("🔄 Using direct connection without proxy")
             
+            # One pooled session serves every fetch of this scan
+            session = await self._get_session()
+            
             # Scan main page
-            await self._send_progress_update("📄 *Scanning main page\.\.\.*")
-            await self._scan_page_with_retry(normalized_url, scan_result)
+            await self._send_progress_update(_PROGRESS_MAIN_PAGE, progress_callback)
+            main_html = await self._scan_page_with_retry(session, normalized_url, scan_result)
+            if main_html is None:
+                # Nothing was scanned, so this must not be reported (or cached) as a clean result
+                raise RuntimeError(f"Failed to fetch main page {normalized_url}")
             
-            # Find and scan JavaScript files
-            await self._send_progress_update("🔍 *Searching for JavaScript files\.\.\.*")
-            await self._find_and_scan_js_files_with_retry(normalized_url, scan_result)
+            # Find and scan JavaScript files, reusing the main page's HTML
+            await self._send_progress_update(_PROGRESS_JS_SEARCH, progress_callback)
+            if main_html:
+                await self._scan_js_files_from_html(session, main_html, normalized_url, scan_result, progress_callback)
                 
             scan_result.status = "completed"
             
@@ -250,41 +527,48 @@ class ScannerService:
             duration = time.time() - start_time
             
             await self._send_progress_update(
-                f"✅ *Scan completed\!*\n"
-                f"🔑 Credentials found: *{total_credentials}*\n"
-                f"🌐 Endpoints found: *{total_endpoints}*\n"
-                f"⏱️ Duration: *{duration:.1f} seconds*"
+                _PROGRESS_COMPLETED_TPL.format(
+                    total_credentials, total_endpoints, f"{duration:.1f}".replace('.', r'\.')
+                ),
+                progress_callback
             )
             
         except (GeneratorExit, asyncio.CancelledError):
             # Handle graceful shutdown
             scan_result.status = "cancelled"
             scan_result.error_message = "Scan cancelled due to shutdown"
-            await self._send_progress_update("❌ *Scan cancelled*")
+            await self._send_progress_update(_PROGRESS_CANCELLED, progress_callback)
             raise  # Re-raise to allow proper cleanup
         except Exception as e:
             scan_result.status = "error"
             scan_result.error_message = str(e)
-            await self._send_progress_update(self._format_error_message(str(e)))
+            await self._send_progress_update(self._format_error_message(str(e)), progress_callback)
             self.logger.error(f"❌ Scan failed: {e}")
         
         scan_result.scan_duration = time.time() - start_time
         return scan_result
     
-    async def _scan_page_with_retry(self, url: str, scan_result: ScanResult) -> None:
+    async def _scan_page_with_retry(self, session: aiohttp.ClientSession, url: str,
+                                    scan_result: ScanResult) -> Optional[str]:
         """Scan a single page with retry logic
         
         Args:
+            session: HTTP session shared by the scan
             url: Page URL to scan
             scan_result: Result object to update
+            
+        Returns:
+            Page content, or None if it couldn't be fetched
         """
+        content = None
         try:
-            content = await self._make_request_with_retry(url)
+            content = await self._make_request_with_retry(session, url)
             if content:
-                self._analyze_content(content, url, scan_result)
+                await self._analyze_content_off_loop(content, url, scan_result)
                 self.logger.info(f"Successfully scanned page: {url}")
         except Exception as e:
             self.logger.warning(f"Failed to scan page {url}: {str(e)}")
+        return content
     
     async def _scan_page(self, session: aiohttp.ClientSession, url: str, scan_result: ScanResult) -> None:
         """Scan a single page for credentials and endpoints
@@ -302,45 +586,77 @@ class ScannerService:
         except Exception:
             pass  # Continue scanning other resources
     
-    async def _find_and_scan_js_files_with_retry(self, base_url: str, scan_result: ScanResult) -> None:
-        """Find and scan JavaScript files with retry logic
+    async def _scan_js_files_from_html(self, session: aiohttp.ClientSession, content: str, base_url: str,
+                                       scan_result: ScanResult, progress_callback=None) -> None:
+        """Find and scan the JavaScript files referenced by an already fetched page
         
         Args:
+            session: HTTP session shared by the scan
+            content: HTML of the page
             base_url: Base URL of the website
             scan_result: Result object to update
+            progress_callback: Per-scan progress callback
         """
         try:
-            content = await self._make_request_with_retry(base_url)
-            if content:
-                soup = BeautifulSoup(content, 'html.parser')
-                
-                # Find script tags with src attribute
-                script_tags = soup.find_all('script', src=True)
+            # Find script tags with src attribute
+            script_tags = self._extract_script_srcs(content)
+            
+            # Send progress update with JS files count
+            await self._send_progress_update(_PROGRESS_JS_FOUND_TPL.format(len(script_tags)), progress_callback)
+            
+            if script_tags:
+                await self._send_progress_update(_PROGRESS_CREDENTIALS, progress_callback)
                 
-                # Send progress update with JS files count
-                await self._send_progress_update(f"📄 *JS files found:* {len(script_tags)} files")
+                # A fixed pool of workers drains the queue, so only that many
+                # responses are in flight or awaiting analysis at once
+                queue: asyncio.Queue = asyncio.Queue()
+                for src in script_tags:
+                    queue.put_nowait(urljoin(base_url, src))
                 
-                # Limit concurrent requests
-                semaphore = asyncio.Semaphore(3)  # Reduced for stability
-                tasks = []
+                workers = min(JS_SCAN_WORKERS, len(script_tags))
+                await asyncio.gather(
+                    *(self._js_scan_worker(session, queue, scan_result) for _ in range(workers)),
+                    return_exceptions=True
+                )
+                self.logger.info(f"Scanned {len(script_tags)} JavaScript files")
+            else:
+                await self._send_progress_update(_PROGRESS_NO_JS, progress_callback)
                 
-                if script_tags:
-                    await self._send_progress_update("🔍 *Searching for credentials\.\.\.*")
-                    
-                    for script in script_tags:
-                        script_url = urljoin(base_url, script['src'])
-                        task = self._scan_js_file_with_retry_semaphore(semaphore, script_url, scan_result)
-                        tasks.append(task)
-                    
-                    if tasks:
-                        await asyncio.gather(*tasks, return_exceptions=True)
-                        self.logger.info(f"Scanned {len(script_tags)} JavaScript files")
-                else:
-                    await self._send_progress_update("ℹ️ *No JavaScript files found*")
-                    
         except Exception as e:
             self.logger.warning(f"Failed to find JS files from {base_url}: {str(e)}")
     
+    async def _js_scan_worker(self, session: aiohttp.ClientSession, queue: asyncio.Queue,
+                              scan_result: ScanResult) -> None:
+        """Scan queued JavaScript file URLs until the queue is empty
+        
+        Args:
+            session: HTTP session shared by the scan
+            queue: Queue of JavaScript file URLs
+            scan_result: Result object to update
+        """
+        while True:
+            try:
+                script_url = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await self._scan_js_file_with_retry_semaphore(self._sem, session, script_url, scan_result)
+    
+    def _extract_script_srcs(self, content: str) -> List[str]:
+        """Extract the src of every script tag in an HTML page
+        
+        A regex is enough for this one attribute and skips building a DOM.
+        
+        Args:
+            content: HTML content
+            
+        Returns:
+            List of script src values with HTML entities decoded
+        """
+        return [
+            html.unescape(match.group(1) or match.group(2) or match.group(3) or '')
+            for match in _SCRIPT_SRC_RE.finditer(content)
+        ]
+    
     async def _find_and_scan_js_files(self, session: aiohttp.ClientSession, base_url: str, scan_result: ScanResult) -> None:
         """Find and scan JavaScript files from the main page
         
@@ -353,17 +669,15 @@ class ScannerService:
             async with session.get(base_url) as response:
                 if response.status == 200:
                     content = await response.text()
-                    soup = BeautifulSoup(content, 'html.parser')
-                    
                     # Find script tags with src attribute
-                    script_tags = soup.find_all('script', src=True)
+                    script_tags = self._extract_script_srcs(content)
                     
                     # Limit concurrent requests
                     semaphore = asyncio.Semaphore(5)
                     tasks = []
                     
-                    for script in script_tags:
-                        script_url = urljoin(base_url, script['src'])
+                    for src in script_tags:
+                        script_url = urljoin(base_url, src)
                         task = self._scan_js_file_with_semaphore(semaphore, session, script_url, scan_result)
                         tasks.append(task)
                     
@@ -373,33 +687,32 @@ class ScannerService:
         except Exception:
             pass  # Continue with main page scan
     
-    async def _scan_js_file_with_retry_semaphore(self, semaphore: asyncio.Semaphore, script_url: str, scan_result: ScanResult) -> None:
+    async def _scan_js_file_with_retry_semaphore(self, semaphore: asyncio.Semaphore, session: aiohttp.ClientSession,
+                                                 script_url: str, scan_result: ScanResult) -> None:
         """Scan JavaScript file with retry logic and semaphore for concurrency control
         
         Args:
             semaphore: Semaphore for concurrency control
+            session: HTTP session shared by the scan
             script_url: JavaScript file URL
             scan_result: Result object to update
         """
         async with semaphore:
-            await self._scan_js_file_with_retry(script_url, scan_result)
+            await self._scan_js_file_with_retry(session, script_url, scan_result)
     
-    async def _scan_js_file_with_retry(self, script_url: str, scan_result: ScanResult) -> None:
+    async def _scan_js_file_with_retry(self, session: aiohttp.ClientSession, script_url: str,
+                                       scan_result: ScanResult) -> None:
         """Scan JavaScript file with retry logic
         
         Args:
+            session: HTTP session shared by the scan
             script_url: JavaScript file URL
             scan_result: Result object to update
         """
         try:
-            content = await self._make_request_with_retry(script_url)
+            content = await self._make_request_with_retry(session, script_url, max_bytes=self.max_file_size)
             if content:
-                # Check content length
-                if len(content) > self.max_file_size:
-                    self.logger.warning(f"JavaScript file too large: {script_url}")
-                    return
-                
-                self._analyze_content(content, script_url, scan_result)
+                await self._analyze_content_off_loop(content, script_url, scan_result)
                 self.logger.info(f"Successfully scanned JS file: {script_url}")
         except Exception as e:
             self.logger.warning(f"Failed to scan JS file {script_url}: {str(e)}")
@@ -448,60 +761,169 @@ class ScannerService:
             source: Source URL/file
             scan_result: Result object to update
         """
-        # Find credentials
-        self._find_credentials(content, source, scan_result)
+        credentials, endpoints = self._collect_findings(content, source)
+        self._add_findings(scan_result, credentials, endpoints)
+    
+    async def _analyze_content_off_loop(self, content: str, source: str, scan_result: ScanResult) -> None:
+        """Analyze content in the analysis thread pool
+        
+        Matching runs off the event loop so other fetches keep progressing;
+        the findings are added to scan_result back on the loop.
+        
+        Args:
+            content: Content to analyze
+            source: Source URL/file
+            scan_result: Result object to update
+        """
+        loop = asyncio.get_running_loop()
+        credentials, endpoints = await loop.run_in_executor(
+            self.analysis_executor, self._collect_findings, content, source
+        )
+        self._add_findings(scan_result, credentials, endpoints)
+    
+    def _collect_findings(self, content: str, source: str) -> Tuple[List[CredentialMatch], List[EndpointMatch]]:
+        """Find credentials and endpoints without touching shared state
+        
+        Args:
+            content: Content to analyze
+            source: Source URL/file
+            
+        Returns:
+            Tuple of (credentials, endpoints) found
+        """
+        return list(self._find_credentials(content, source)), list(self._find_endpoints(content, source))
+    
+    def _add_findings(self, scan_result: ScanResult, credentials: List[CredentialMatch],
+                      endpoints: List[EndpointMatch]) -> None:
+        """Record collected findings in a scan result
         
-        # Find endpoints
-        self._find_endpoints(content, source, scan_result)
+        Args:
+            scan_result: Result object to update
+            credentials: Credentials to add
+            endpoints: Endpoints to add
+        """
+        for credential in credentials:
+            scan_result.add_credential(credential)
+        for endpoint in endpoints:
+            scan_result.add_endpoint(endpoint)
     
-    def _find_credentials(self, content: str, source: str, scan_result: ScanResult) -> None:
+    def _find_credentials(self, content: str, source: str) -> Iterator[CredentialMatch]:
         """Find credentials in content
         
         Args:
             content: Content to search
             source: Source URL/file
-            scan_result: Result object to update
+            
+        Yields:
+            CredentialMatch for each credential found
         """
-        lines = content.split('\n')
-        
-        for cred_type, patterns in self.credential_patterns.items():
-            for pattern in patterns:
-                for line_num, line in enumerate(lines, 1):
-                    matches = re.finditer(pattern, line, re.IGNORECASE)
-                    for match in matches:
-                        credential = CredentialMatch(
-                            type=cred_type,
-                            value=match.group(1) if match.groups() else match.group(0),
-                            context=self._get_context(content, match.start(), 50),
-                            source=self._get_short_source(source),
-                            line_number=line_num,
-                            confidence=self._get_confidence_level(cred_type, match.group(0))
-                        )
-                        scan_result.credentials.append(credential)
-    
-    def _find_endpoints(self, content: str, source: str, scan_result: ScanResult) -> None:
+        candidates = self._credential_candidates(content)
+        if not candidates:
+            return
+        
+        # Per-file and per-pattern work is done once, outside the match loop
+        short_source = self._get_short_source(source)
+        get_context = self._get_context
+        get_confidence_level = self._get_confidence_level
+        # Repeats would be dropped by the scan result anyway, so skip them
+        # before their context is sliced out
+        seen = set()
+        
+        for cred_type, pattern in candidates:
+            value_group = 1 if pattern.groups else 0
+            for match, line_num in self._iter_line_matches(pattern, content):
+                value = match.group(value_group)
+                key = (cred_type, value)
+                if key in seen:
+                    continue
+                seen.add(key)
+                
+                yield CredentialMatch(
+                    type=cred_type,
+                    value=value,
+                    context=get_context(content, match.start(), 50),
+                    source=short_source,
+                    line_number=line_num,
+                    confidence=get_confidence_level(cred_type, match.group(0))
+                )
+    
+    def _find_endpoints(self, content: str, source: str) -> Iterator[EndpointMatch]:
         """Find API endpoints in content
         
         Args:
             content: Content to search
             source: Source URL/file
-            scan_result: Result object to update
+            
+        Yields:
+            EndpointMatch for each valid endpoint found
         """
-        lines = content.split('\n')
-        
-        for pattern in self.endpoint_patterns:
-            for line_num, line in enumerate(lines, 1):
-                matches = re.finditer(pattern, line, re.IGNORECASE)
-                for match in matches:
-                    endpoint_url = match.group(1)
-                    if self._is_valid_endpoint(endpoint_url):
-                        endpoint = EndpointMatch(
-                            url=endpoint_url,
-                            method=self._detect_http_method(line),
-                            source=self._get_short_source(source),
-                            line_number=line_num
-                        )
-                        scan_result.endpoints.append(endpoint)
+        short_source = self._get_short_source(source)
+        is_valid_endpoint = self._is_valid_endpoint
+        seen = set()
+        
+        for pattern in self._compiled_endpoint_patterns:
+            for match, line_num in self._iter_line_matches(pattern, content):
+                endpoint_url = match.group(1)
+                if is_valid_endpoint(endpoint_url):
+                    line_start = content.rfind('\n', 0, match.start()) + 1
+                    line_end = content.find('\n', match.end())
+                    if line_end == -1:
+                        line_end = len(content)
+                    method = self._detect_http_method(content, line_start, line_end)
+                    key = (endpoint_url, method)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    
+                    yield EndpointMatch(
+                        url=endpoint_url,
+                        method=method,
+                        source=short_source,
+                        line_number=line_num
+                    )
+    
+    def _iter_line_matches(self, pattern: re.Pattern, content: str):
+        """Yield the matches a line-by-line scan would find, scanning content once
+        
+        The whole content is searched in one pass. The rare match that spans a
+        line break is discarded and the lines it touched are rescanned one at a
+        time, so results are identical to matching each line separately. Line
+        numbers are kept by counting line breaks between consecutive matches.
+        
+        Args:
+            pattern: Compiled pattern (must not match the empty string)
+            content: Content to search
+            
+        Yields:
+            Tuples of (match, 1-based line number)
+        """
+        pos = 0
+        line_num = 1
+        counted = 0  # Line breaks before this offset are included in line_num
+        while True:
+            match = pattern.search(content, pos)
+            if match is None:
+                return
+            
+            start, end = match.span()
+            line_num += content.count('\n', counted, start)
+            counted = start
+            if content.find('\n', start, end) == -1:
+                yield match, line_num
+                pos = end
+                continue
+            
+            # Rescan the touched lines separately, bounded by their line breaks
+            line_start = content.rfind('\n', 0, start) + 1
+            while line_start < end:
+                line_end = content.find('\n', line_start)
+                if line_end == -1:
+                    line_end = len(content)
+                for line_match in pattern.finditer(content, max(pos, line_start), line_end):
+                    yield line_match, line_num
+                line_num += 1
+                line_start = counted = line_end + 1
+            pos = line_end + 1
     
     def _get_context(self, content: str, index: int, context_length: int = 50) -> str:
         """Get context around a match
@@ -541,7 +963,7 @@ class ScannerService:
         Returns:
             Confidence level (high/medium/low)
         """
-        if cred_type in ['firebase_key', 'aws_key', 'github_token']:
+        if cred_type in self._HIGH_CONFIDENCE_TYPES:
             return 'high'
         elif len(value) > 40:
             return 'high'
@@ -559,34 +981,23 @@ class ScannerService:
         Returns:
             True if valid endpoint
         """
-        # Filter out common false positives
-        false_positives = [
-            '.css', '.js', '.png', '.jpg', '.jpeg', '.gif', '.svg',
-            '.ico', '.woff', '.ttf', '.eot', '.map'
-        ]
-        
-        endpoint_lower = endpoint.lower()
-        return not any(fp in endpoint_lower for fp in false_positives)
+        # Filter out static assets
+        return self._fp_re.search(endpoint) is None
     
-    def _detect_http_method(self, line: str) -> str:
+    def _detect_http_method(self, line: str, start: int = 0, end: Optional[int] = None) -> str:
         """Detect HTTP method from line context
         
         Args:
-            line: Line containing endpoint
+            line: Line containing endpoint, or content holding it
+            start: Offset where the line starts
+            end: Offset where the line ends (defaults to the end of line)
             
         Returns:
-            HTTP method (GET/POST/PUT/DELETE)
+            HTTP method (GET/POST/PUT/DELETE/PATCH)
         """
-        line_lower = line.lower()
-        
-        if 'post' in line_lower:
-            return 'POST'
-        elif 'put' in line_lower:
-            return 'PUT'
-        elif 'delete' in line_lower:
-            return 'DELETE'
-        else:
-            return 'GET'
+        # Searching within bounds avoids copying long minified lines
+        match = self._method_re.search(line, start, len(line) if end is None else end)
+        return match.group(1).upper() if match else 'GET'
 
     # Removed duplicate _escape_markdown function - using _escape_markdown_v2 instead
     
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import asyncio
 from services.scanner_service import ScannerService
+from utils.event_loop import install_event_loop_policy
 
 async def test_multiple_websites():
     """Test scanner with multiple websites"""
@@ -13,31 +14,40 @@ async def test_multiple_websites():
         'https://github.com'
     ]
     
-    for url in websites:
-        print(f"\n🔍 Testing scanner with {url}...")
+    print(f"\n🔍 Testing scanner with {len(websites)} websites concurrently...")
+    
+    # Sites are scanned concurrently over the scanner's shared connection pool
+    try:
+        results = await asyncio.gather(
+            *(scanner.scan_website(url) for url in websites),
+            return_exceptions=True
+        )
+    finally:
+        await scanner.close()
+    
+    for url, result in zip(websites, results):
+        if isinstance(result, Exception):
+            print(f"❌ Error testing {url}: {result}")
+            print("-" * 50)
+            continue
+        
+        print(f"📊 Results for {url}:")
+        print(f"• Credentials: {len(result.credentials)}")
+        print(f"• Endpoints: {len(result.endpoints)}")
+        print(f"• Status: {result.status}")
+        print(f"• Duration: {result.scan_duration:.2f}s")
+        
+        if result.error_message:
+            print(f"• Error: {result.error_message}")
         
-        try:
-            result = await scanner.scan_website(url)
-            
-            print(f"📊 Results for {url}:")
-            print(f"• Credentials: {len(result.credentials)}")
-            print(f"• Endpoints: {len(result.endpoints)}")
-            print(f"• Status: {result.status}")
-            print(f"• Duration: {result.scan_duration:.2f}s")
-            
-            if result.error_message:
-                print(f"• Error: {result.error_message}")
-            
-            if result.credentials:
-                print(f"🔐 Credentials found:")
-                for i, cred in enumerate(result.credentials[:5], 1):
-                    print(f"  {i}. {cred.type}: {cred.value[:50]}...")
-                    print(f"     Source: {cred.source}")
-                    
-        except Exception as e:
-            print(f"❌ Error testing {url}: {e}")
+        if result.credentials:
+            print(f"🔐 Credentials found:")
+            for i, cred in enumerate(result.credentials[:5], 1):
+                print(f"  {i}. {cred.type}: {cred.value[:50]}...")
+                print(f"     Source: {cred.source}")
         
         print("-" * 50)
 
 if __name__ == "__main__":
+    install_event_loop_policy()
     asyncio.run(test_multiple_websites())
\ No newline at end of file
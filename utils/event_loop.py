@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Event Loop Selection
+Installs the fastest asyncio event loop available on this platform
+"""
+
+import asyncio
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+
+def install_event_loop_policy():
+    """Use the fastest available asyncio event loop.
+    
+    Prefers an io_uring loop (uringcore, Linux only), then uvloop, and
+    otherwise keeps the default loop.
+    """
+    if sys.platform == 'win32':
+        return
+    
+    if sys.platform.startswith('linux'):
+        try:
+            import uringcore
+        except ImportError:
+            pass
+        else:
+            asyncio.set_event_loop_policy(uringcore.EventLoopPolicy())
+            logger.info("⚡ Using io_uring event loop")
+            return
+    
+    try:
+        import uvloop
+    except ImportError:
+        return
+    
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("⚡ Using uvloop event loop")